@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -19,5 +20,8 @@ def find_dotenv():
 dotenv_path = find_dotenv()
 load_dotenv(dotenv_path, override=True)
 
+# The .env file is loaded once at import, so the key is read from the environment only once as well;
+# call chat_gtp_connection.cache_clear() after changing it.
+@lru_cache(maxsize=1)
 def chat_gtp_connection():
     return os.getenv('CHATGTP_API')
\ No newline at end of file
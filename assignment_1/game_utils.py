@@ -1,51 +1,55 @@
 import logging
+from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks
 from autobahn.twisted.util import sleep
 
 logger = logging.getLogger(__name__)
 
+# Translation table that deletes the "<" and ">" characters used in the prompts.
+_STRIP_ANGLES = str.maketrans("", "", "<>")
+
 
 @inlineCallbacks
-def wait_for_response(prompt_text, session, stt, timeout=15):
+def wait_for_response(prompt_text, session, stt, timeout=15, poll_interval=0.1):
     """
     Waits for an STT response from the user.
     If prompt_text is provided, the robot will speak it; if None, no dialogue is spoken.
-    It resets the STT words list and then polls for a response.
+    It resets the STT words list and then polls for a response every poll_interval seconds.
 
     :param prompt_text: Optional text to speak before waiting for a response.
     :param session: The WAMP session (for dialogue actions).
     :param stt: The shared SpeechToText instance.
     :param timeout: Maximum seconds to wait.
+    :param poll_interval: Seconds between STT checks; kept short so a response is picked up promptly.
     :return: The recognized user response as a string (or None on timeout).
     """
     if prompt_text:
         logger.debug("Prompting user: %s", prompt_text)
-        stt.words = []  # clear previous words
+        stt.words.clear()  # clear previous words
         yield session.call("rie.dialogue.say", text=prompt_text)
         yield sleep(1.5)
-        stt.words = []
+        stt.words.clear()
     else:
         # If no prompt_text, simply clear any previous words.
-        stt.words = []
+        stt.words.clear()
 
     response = None
+    start = reactor.seconds()
     waited = 0.0
-    poll_interval = 1.0
     while not response and waited < timeout:
         yield sleep(poll_interval)
-        waited += poll_interval
+        waited = reactor.seconds() - start
+        # Only fetch the words once the STT has flagged new ones, so empty polls skip the call.
+        if not stt.new_words:
+            continue
         words = stt.give_me_words()  # clears new_words flag.
         if words:
-            raw_response = " ".join(words)
             # Remove all "<" and ">" characters which are used in the prompts
-            cleaned = raw_response.replace("<", "").replace(">", "").strip()
-            # If the cleaned response is very long, take only the first word.
-            if len(cleaned) > 50:
-                cleaned = cleaned.split()[0]
-            response = cleaned
+            response = " ".join(words).translate(_STRIP_ANGLES).strip()
+            # If the response is very long, take only the first word left after the cleanup.
+            if len(response) > 50:
+                response = next(iter(response.split()), "")
             logger.debug("Received STT response: %s", response)
-        else:
-            logger.debug("Waiting for STT response... (%.1f/%d sec)", waited, timeout)
     if not response:
         logger.debug("Timeout reached with no response.")
     return response
@@ -1,5 +1,5 @@
 from autobahn.twisted.component import Component, run
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import Deferred, inlineCallbacks
 from autobahn.twisted.util import sleep
 from twisted.internet.task import LoopingCall
 from play_game import play_game
@@ -54,9 +54,8 @@ def main(session, details):
     # Start the guessing game, passing the shared STT instance.
     yield play_game(session, stt)
 
-    # Keep the session alive.
-    while True:
-        yield sleep(1)
+    # Keep the session alive without waking the reactor: this Deferred never fires.
+    yield Deferred()
 
 # Configure the WAMP component.
 wamp = Component(
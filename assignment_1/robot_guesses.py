@@ -1,13 +1,43 @@
 import logging
-import re
 import string
+from collections import deque
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.threads import deferToThread
 from autobahn.twisted.util import sleep
-from api.api_handler import guess
+from api.api_handler import clear_guess_cache, plan_guesses
 from game_utils import wait_for_response
 
 logger = logging.getLogger(__name__)
 
+# Translation table that deletes the "<" and ">" delimiters from generated questions.
+_STRIP_ANGLES = str.maketrans("", "", "<>")
+
+# Translation table that deletes punctuation from user feedback before the win check.
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+
+# Phrases in the (cleaned) feedback that mean the robot guessed the word.
+_WIN_KEYWORDS = ("correct", "yes thats it", "exactly", "yes you guessed it")
+
+
+# Answers for which the follow-up question is generated speculatively while the user is still answering.
+_LIKELY_ANSWERS = ("yes", "no")
+
+
+def prefetch_next_guesses(question, previous_guesses, answers=_LIKELY_ANSWERS):
+    """
+    Starts planning the next questions for each of the given answers to `question`,
+    so the API latency overlaps with the robot speaking and the user answering.
+
+    :param question: The question the robot is about to ask.
+    :param previous_guesses: The rounds played before this question.
+    :param answers: The answers to plan for.
+    :return: Dict mapping each answer to a Deferred firing with the list of follow-up questions.
+    """
+    return {
+        answer: deferToThread(plan_guesses, answer, previous_guesses + [{'guess': question, 'feedback': answer}])
+        for answer in answers
+    }
+
 
 @inlineCallbacks
 def play_game_robot_guesses(session, stt):
@@ -15,6 +45,8 @@ def play_game_robot_guesses(session, stt):
     Game mode where the user thinks of a word and the robot tries to guess it by asking yes/no questions.
     """
     logger.debug("Starting play_game_robot_guesses()")
+    # Planned questions are cached per prompt; start every game with an empty cache.
+    clear_guess_cache()
     previous_guesses = []  # Each entry: {'guess': <question>, 'feedback': <user response>}
 
     yield session.call("rie.dialogue.say", text="Great! Please think of a word and keep it in your mind.")
@@ -37,19 +69,30 @@ def play_game_robot_guesses(session, stt):
     max_rounds = 15
     round_counter = 0
 
+    planned = deque()  # Questions still to ask while the user keeps answering "no".
+    next_plan = None
     while round_counter < max_rounds:
         logger.debug("Round %d starting...", round_counter + 1)
-        # Generate the next question using ChatGPT.
-        guess_question = guess(last_feedback, previous_guesses)
-        # Remove all '<' and '>' characters from the prompts
-        clean_guess = re.sub(r'[<>]', '', guess_question).strip()
+        if not planned:
+            # Plan the next questions using ChatGPT (in a thread, so the reactor keeps handling audio),
+            # unless they were already prefetched for the user's answer in the previous round.
+            if next_plan is None:
+                next_plan = deferToThread(plan_guesses, last_feedback, previous_guesses)
+            questions = yield next_plan
+            # Remove all '<' and '>' characters from the prompts
+            planned.extend(q.translate(_STRIP_ANGLES).strip() for q in questions)
+        clean_guess = planned.popleft()
         logger.debug("Generated guess question: %s", clean_guess)
 
+        # A "yes" invalidates the rest of the plan, as does a "no" once the plan runs out;
+        # start on the follow-up questions while the robot speaks and the user answers.
+        prefetched = prefetch_next_guesses(clean_guess, previous_guesses,
+                                           ("yes",) if planned else _LIKELY_ANSWERS)
+
         # Robot speaks the question.
         yield session.call("rie.dialogue.say", text=clean_guess)
-        yield sleep(3)
 
-        # Wait for the user's answer.
+        # Wait for the user's answer straight away; the prefetched questions are generated meanwhile.
         feedback = yield wait_for_response(None, session, stt)
         if not feedback:
             feedback = "No response"
@@ -57,19 +100,26 @@ def play_game_robot_guesses(session, stt):
         else:
             logger.debug("Feedback received: %s", feedback)
 
+        # Clean feedback (remove punctuation) for a robust match.
+        feedback_cleaned = feedback.lower().translate(_PUNCT_TABLE)
+        # A plain yes/no is stored in its canonical form so the prefetched questions match this state.
+        if feedback_cleaned.strip() in _LIKELY_ANSWERS:
+            feedback = feedback_cleaned.strip()
+
         previous_guesses.append({'guess': clean_guess, 'feedback': feedback})
         round_counter += 1
 
-        # Clean feedback (remove punctuation) for a robust match.
-        feedback_cleaned = feedback.lower().translate(str.maketrans("", "", string.punctuation))
-        win_keywords = ["correct", "yes thats it", "exactly", "yes you guessed it"]
-        if any(affirm in feedback_cleaned for affirm in win_keywords):
+        if any(affirm in feedback_cleaned for affirm in _WIN_KEYWORDS):
             yield session.call("rie.dialogue.say", text="Yay! I guessed it!")
             logger.debug("User confirmed correct guess. Ending game.")
             break
         else:
             last_feedback = feedback
-            logger.debug("Continuing game with last feedback: %s", last_feedback)
+            if feedback != "no":
+                planned.clear()
+            next_plan = prefetched.get(feedback)
+            logger.debug("Continuing game with last feedback: %s (planned: %d, prefetched: %s)",
+                         last_feedback, len(planned), next_plan is not None)
 
     if round_counter >= max_rounds:
         yield session.call("rie.dialogue.say", text="I give up! That was a challenging word.")
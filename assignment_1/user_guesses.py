@@ -1,8 +1,9 @@
 import logging
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import DeferredList, inlineCallbacks
+from twisted.internet.threads import deferToThread
 from autobahn.twisted.util import sleep
 from game_utils import wait_for_response
-from api.api_handler import answer_question_with_api, generate_secret_word
+from api.api_handler import answer_question_with_api, clear_answer_cache, generate_secret_word
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +16,10 @@ def play_game_user_guesses(session, stt):
     the game ends with a win.
     """
     logger.debug("Starting play_game_user_guesses()")
+    # Answers are cached per (word, question); start every game with an empty cache.
+    clear_answer_cache()
     # Generate a secret word using ChatGPT.
-    chosen_word = generate_secret_word()
+    chosen_word = yield deferToThread(generate_secret_word)
     logger.debug("Robot's chosen word (generated via ChatGPT): %s", chosen_word)
 
     yield session.call("rie.dialogue.say", text="I have chosen a word. Ask me yes/no questions to narrow it down.")
@@ -37,8 +40,11 @@ def play_game_user_guesses(session, stt):
             logger.debug("User mentioned the secret word. Ending game.")
             break
         else:
-            # Use the API to answer the user's yes/no question.
-            answer = answer_question_with_api(chosen_word, user_input)
+            # Use the API to answer the user's yes/no question (in a thread), while a filler line is spoken.
+            d_api = deferToThread(answer_question_with_api, chosen_word, user_input)
+            d_filler = session.call("rie.dialogue.say", text="Hmm, let me think.")
+            results = yield DeferredList([d_api, d_filler], consumeErrors=True)
+            answer = results[0][1]
             logger.debug("Answer from API: %s", answer)
             yield session.call("rie.dialogue.say", text=answer)
             round_counter += 1
@@ -1,128 +1,286 @@
+import os
 import re
+import json
 import logging
+import threading
+from collections import deque
+from functools import lru_cache
+import httpx
 from openai import OpenAI
 from .conn import chat_gtp_connection
 
 logger = logging.getLogger(__name__)
 
-def build_prompt(previous_guesses, last_user_input):
+# Matches the question between the <<< and >>> delimiters in a guess response.
+_GUESS_RE = re.compile(r'<<<(.*?)>>>', re.DOTALL)
+
+# Matches the JSON array of planned questions in a guess response.
+_PLAN_RE = re.compile(r'\[.*?\]', re.DOTALL)
+
+# Model used to generate guess questions; override with the GUESS_MODEL environment variable.
+GUESS_MODEL = os.environ.get("GUESS_MODEL", "gpt-4o-mini")
+
+# Number of most recent rounds written out in full in the guess prompt; older rounds are summarized on one line.
+PROMPT_HISTORY_ROUNDS = 6
+
+# Number of questions requested per API call; the robot works through them while the user keeps answering "no".
+GUESS_BATCH_SIZE = 3
+
+# Matches the word on one line of the secret word list (drops numbering and punctuation).
+_WORD_RE = re.compile(r'[A-Za-z]+')
+
+# Number of secret words generated per API call, and the queue size below which a background refill starts.
+SECRET_WORD_BATCH = 20
+SECRET_WORD_LOW_WATER = 5
+
+# Secret words generated ahead of time; the lock keeps concurrent refills from both calling the API.
+_word_queue = deque()
+_refill_lock = threading.Lock()
+
+# Matches the characters dropped when normalizing a question for the answer cache.
+_NON_WORD_RE = re.compile(r'[^\w ]+')
+
+# Shared OpenAI client, created on first use so every call reuses the same HTTP connection pool.
+# API calls run in worker threads, so creating it is locked.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """
+    Returns the shared OpenAI client, creating it the first time it is needed.
+    Its HTTP pool keeps connections to the API alive between rounds, also for the
+    concurrent requests made when prefetching guesses.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_client = httpx.Client(
+                    timeout=httpx.Timeout(30.0, connect=5.0),
+                    limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0)
+                )
+                _client = OpenAI(api_key=chat_gtp_connection(), http_client=http_client)
+    return _client
+
+
+def build_prompt(previous_guesses, last_user_input, count=GUESS_BATCH_SIZE):
     """
     Build the prompt using previous rounds and the latest user response.
-    The output should be delimited by <<< and >>>.
+    Only the last PROMPT_HISTORY_ROUNDS rounds are listed in full; older ones are collapsed into one
+    compact "Earlier:" line, so the model keeps every answer while the prompt grows slowly.
+    The model is asked for the next `count` questions as a JSON array, each one written
+    assuming the answers to the questions before it were "no".
     """
-    prompt = (
+    parts = [
         "You are a guessing game assistant. The player is thinking of a word, "
         "and your goal is to guess it by asking yes/no questions. "
         "Use the feedback from previous rounds to refine your questions.\n\n"
         "Previous rounds:\n"
-    )
+    ]
     if previous_guesses:
-        for idx, entry in enumerate(previous_guesses, start=1):
-            prompt += f"{idx}. Question: {entry['guess']} | Feedback: {entry['feedback']}\n"
+        skipped = max(0, len(previous_guesses) - PROMPT_HISTORY_ROUNDS)
+        if skipped:
+            earlier = "; ".join(f"{entry['guess']} -> {entry['feedback']}" for entry in previous_guesses[:skipped])
+            parts.append(f"Earlier: {earlier}\n")
+        for idx, entry in enumerate(previous_guesses[skipped:], start=skipped + 1):
+            parts.append(f"{idx}. Question: {entry['guess']} | Feedback: {entry['feedback']}\n")
     else:
-        prompt += "None\n"
+        parts.append("None\n")
     if last_user_input:
-        prompt += f"\nThe latest user response was: \"{last_user_input}\"\n"
-    prompt += (
-        "\nBased on this context, propose your next yes/no question to narrow down the word. "
-        "Output only the question enclosed between <<< and >>>. For example:\n"
-        "<<<Is it an animal?>>>\n"
+        parts.append(f"\nThe latest user response was: \"{last_user_input}\"\n")
+    parts.append(
+        f"\nBased on this context, propose your next {count} yes/no questions to narrow down the word, "
+        "most informative first. Write each question assuming the player answered \"no\" to the ones before it. "
+        "Output only a JSON array of strings. For example:\n"
+        "[\"Is it an animal?\", \"Is it something you can eat?\", \"Is it found indoors?\"]\n"
     )
-    return prompt
+    return "".join(parts)
 
 def parse_response(response_text):
     """
-    Extracts the text between <<< and >>>. If not found, returns the full response.
+    Extracts the list of questions from the JSON array in the response.
+    Falls back to questions delimited by <<< and >>>, and then to the full response.
     """
-    match = re.search(r'<<<(.*?)>>>', response_text, re.DOTALL)
+    match = _PLAN_RE.search(response_text)
     if match:
-        return match.group(1).strip()
-    return response_text.strip()
+        try:
+            questions = [str(q).strip() for q in json.loads(match.group(0))]
+        except ValueError:
+            questions = []
+        questions = [q for q in questions if q]
+        if questions:
+            return questions
+    questions = [q.strip() for q in _GUESS_RE.findall(response_text) if q.strip()]
+    return questions or [response_text.strip()]
 
-def guess(last_user_input, previous_guesses):
+@lru_cache(maxsize=128)
+def _request_guesses(prompt):
     """
-    Calls the ChatGPT API with a templated prompt to generate the next guess.
-    Silences extra HTTP debugging and handles errors.
+    Sends a guess prompt to ChatGPT and returns the parsed questions as a tuple.
+    Cached on the prompt text, so a repeated game state (e.g. a "No response" retry)
+    reuses the earlier questions instead of making another API call. Every game starts
+    from the same prompt, so clear_guess_cache() is called at the start of each game.
+    The completion is streamed and closed as soon as the full JSON array has arrived.
+    """
+    client = _get_client()
+    stream = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model=GUESS_MODEL,
+        max_tokens=120,
+        temperature=0.8,
+        stream=True
+    )
+    raw_response = ""
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            raw_response += chunk.choices[0].delta.content or ""
+            if _PLAN_RE.search(raw_response):
+                break
+    finally:
+        stream.close()
+    raw_response = raw_response.strip()
+    logger.debug("Raw response from ChatGPT: %s", raw_response)
+    return tuple(parse_response(raw_response))
+
+def plan_guesses(last_user_input, previous_guesses):
+    """
+    Calls the ChatGPT API with a templated prompt to plan the next GUESS_BATCH_SIZE guesses.
+    Silences extra HTTP debugging and handles errors; always returns at least one question.
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
         prompt = build_prompt(previous_guesses, last_user_input)
         logger.debug("Built prompt for guess: %s", prompt)
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gpt-4o-mini",
-            max_tokens=200,
-            temperature=0.8
-        )
-        raw_response = response.choices[0].message.content.strip()
-        logger.debug("Raw response from ChatGPT: %s", raw_response)
-        return parse_response(raw_response)
+        return list(_request_guesses(prompt))
     except Exception as e:
         logger.error("Error in guess call: %s", e)
-        return "I'm sorry, I couldn't generate a question."
+        return ["I'm sorry, I couldn't generate a question."]
+
+def guess(last_user_input, previous_guesses):
+    """
+    Returns only the next guess question from plan_guesses().
+    """
+    return plan_guesses(last_user_input, previous_guesses)[0]
+
+def clear_guess_cache():
+    """
+    Forgets the questions planned so far, so a new game gets fresh opening questions
+    and a truncated response is not reused.
+    """
+    _request_guesses.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _answer_cached(chosen_word, question):
+    """
+    Asks ChatGPT for the yes/no answer to a normalized question about the chosen word.
+    Cached, so a repeated question is answered without another API call; errors are raised, not cached.
+    """
+    client = _get_client()
+    prompt = (
+        f"The secret word is '{chosen_word}'.\n"
+        f"Answer the following question with only 'yes' or 'no':\n"
+        f"Question: {question}\n"
+    )
+    logger.debug("Built prompt for answer: %s", prompt)
+    # "yes" and "no" are single tokens, so one is enough; the fixed seed keeps repeated answers stable.
+    # Streamed, so the answer is returned as soon as "yes" or "no" has arrived.
+    stream = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model="gpt-4o-mini",
+        max_tokens=1,
+        temperature=0,
+        seed=0,
+        stream=True
+    )
+    raw_response = ""
+    answer = "I don't know"
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            raw_response += (chunk.choices[0].delta.content or "").lower()
+            if "yes" in raw_response:
+                answer = "yes"
+                break
+            elif "no" in raw_response:
+                answer = "no"
+                break
+    finally:
+        stream.close()
+    logger.debug("Raw answer response: %s", raw_response.strip())
+    return answer
 
 
 def answer_question_with_api(chosen_word, question):
     """
     Uses the ChatGPT API to answer a yes/no question about the chosen word.
     The prompt tells the model the secret word and asks it to respond only "yes" or "no."
+    Questions are compared ignoring case, punctuation and extra whitespace, so a repeated
+    question gets the earlier answer straight away.
 
     :param chosen_word: The secret word.
     :param question: The user's yes/no question.
     :return: "yes" or "no" (or "I don't know" on error).
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-        prompt = (
-            f"The secret word is '{chosen_word}'.\n"
-            f"Answer the following question with only 'yes' or 'no':\n"
-            f"Question: {question}\n"
-        )
-        logger.debug("Built prompt for answer: %s", prompt)
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gpt-4o-mini",
-            max_tokens=20,
-            temperature=0
-        )
-        raw_response = response.choices[0].message.content.strip().lower()
-        logger.debug("Raw answer response: %s", raw_response)
-        if "yes" in raw_response:
-            return "yes"
-        elif "no" in raw_response:
-            return "no"
-        else:
-            return "I don't know"
+        return _answer_cached(chosen_word, " ".join(_NON_WORD_RE.sub(" ", question.lower()).split()))
     except Exception as e:
         logger.error("Error in answer_question_with_api: %s", e)
         return "I don't know"
 
 
+def clear_answer_cache():
+    """
+    Forgets the answers given so far, so a new game starts with an empty answer cache.
+    """
+    _answer_cached.cache_clear()
+
+
+def _refill_words(n=SECRET_WORD_BATCH):
+    """
+    Uses the ChatGPT API to generate `n` simple secret words in one call and adds them to the word queue.
+    Errors are logged; the queue is then left as it was.
+    """
+    with _refill_lock:
+        if len(_word_queue) >= SECRET_WORD_LOW_WATER:
+            return  # Another thread refilled the queue while we were waiting.
+        try:
+            client = _get_client()
+            prompt = (
+                f"Please list {n} different simple, common English words (preferably 4-8 letters) that are not "
+                "too complex. Output only the words, one per line."
+            )
+            logger.debug("Built prompt for secret words: %s", prompt)
+            response = client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                model="gpt-4o-mini",
+                max_tokens=n * 5,
+                temperature=1.0
+            )
+            words = [_WORD_RE.search(line) for line in response.choices[0].message.content.splitlines()]
+            words = [match.group(0).lower() for match in words if match]
+            _word_queue.extend(words)
+            logger.debug("Generated secret words: %s", words)
+        except Exception as e:
+            logger.error("Error in generate_secret_word: %s", e)
+
+
 def generate_secret_word():
     """
-    Uses the ChatGPT API to generate a simple secret word.
-    The prompt instructs the model to choose one common word.
+    Returns a simple secret word from the queue of words generated by ChatGPT.
+    The queue is filled SECRET_WORD_BATCH words at a time: synchronously when it is empty,
+    and in a background thread once it runs low, so the next game does not wait for the API.
     """
-    try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-        prompt = (
-            "Please choose one simple, common English word (preferably 4-8 letters) that is not too complex, "
-            "and output only the word."
-        )
-        logger.debug("Built prompt for secret word: %s", prompt)
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gpt-4o-mini",
-            max_tokens=10,
-            temperature=0.5
-        )
-        word = response.choices[0].message.content.strip().lower()
-        logger.debug("Generated secret word: %s", word)
-        return word
-    except Exception as e:
-        logger.error("Error in generate_secret_word: %s", e)
-        # Fallback to a random word from a hardcoded list.
-        return "apple"
\ No newline at end of file
+    if not _word_queue:
+        _refill_words()
+    if not _word_queue:
+        # Fallback when no words could be generated.
+        return "apple"
+    word = _word_queue.popleft()
+    if len(_word_queue) < SECRET_WORD_LOW_WATER:
+        threading.Thread(target=_refill_words, daemon=True).start()
+    logger.debug("Chosen secret word: %s", word)
+    return word
\ No newline at end of file
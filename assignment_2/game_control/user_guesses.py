@@ -1,16 +1,19 @@
 import logging
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import DeferredList, inlineCallbacks
+from twisted.internet.threads import deferToThread
 from autobahn.twisted.util import sleep
 
 from .game_utils import wait_for_response
-from ..api.api_handler import answer_question_with_api, generate_secret_word
+from ..api.api_handler import answer_question_with_api, clear_answer_cache, generate_secret_word
 from assignment_2.gesture_control.say_animated import say_animated
 
 
 @inlineCallbacks
 def play_game_user_guesses(session, stt):
     logger = logging.getLogger(__name__)
-    chosen_word = generate_secret_word()
+    # Answers are cached per (word, question); start every game with an empty cache.
+    clear_answer_cache()
+    chosen_word = yield deferToThread(generate_secret_word)
     logger.debug("Robot's chosen word: %s", chosen_word)
 
     # Use a "beat_gesture" for normal/neutral speech:
@@ -35,8 +38,11 @@ def play_game_user_guesses(session, stt):
             yield say_animated(session, "Congratulations! You guessed it!", gesture_name="celebration")
             break
         else:
-            # Let the API produce a yes/no style answer:
-            answer = answer_question_with_api(chosen_word, user_input)
+            # Let the API produce a yes/no style answer (in a thread), while a filler line is spoken:
+            d_api = deferToThread(answer_question_with_api, chosen_word, user_input)
+            d_filler = say_animated(session, "Hmm, let me think.")
+            results = yield DeferredList([d_api, d_filler], consumeErrors=True)
+            answer = results[0][1]
             logger.debug("Answer from API: %s", answer)
 
             # Decide on nod/shake for yes or no
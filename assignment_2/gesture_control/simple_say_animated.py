@@ -1,10 +1,11 @@
 import os
 import json
 import logging
-import random
 import re
 import time
-from twisted.internet.defer import inlineCallbacks, DeferredList
+from functools import lru_cache
+import numpy as np
+from twisted.internet.defer import Deferred, DeferredList, ensureDeferred, inlineCallbacks
 from autobahn.twisted.util import sleep
 from alpha_mini_rug import perform_movement
 
@@ -15,15 +16,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load the gesture library once.
+# The gesture library is parsed the first time a gesture is requested, not at import.
 GESTURE_FILE = os.path.join(os.path.dirname(__file__), "../gestures.json")
-try:
-    with open(GESTURE_FILE, "r") as f:
-        GESTURE_LIBRARY = json.load(f)
-    logger.debug("Loaded gesture library with keys: %s", list(GESTURE_LIBRARY.keys()))
-except Exception as e:
-    logger.error("Could not load gesture library: %s", e)
-    GESTURE_LIBRARY = {}
 
 # Define a neutral pose for head and arms.
 NEUTRAL_POSE_FRAMES = [
@@ -40,37 +34,111 @@ NEUTRAL_POSE_FRAMES = [
 ]
 
 
-def add_noise_to_frames(frames, time_noise=50, angle_noise=0.05):
+# Random generator for the gesture noise.
+_rng = np.random.default_rng()
+
+
+def frames_to_arrays(frames):
     """
-    Returns a new list of frames with random noise added.
+    Splits keyframes into their times, joint names and angles, so noise can be added to all
+    angles at once. The joints are taken from the first frame; library gestures set the same
+    joints in every frame.
 
     Args:
         frames (list): A list of keyframe dictionaries.
-        time_noise (float): Maximum noise in ms to add/subtract from the frame's time.
+
+    Returns:
+        tuple: (times, joint_names, angles), where angles is an (N, J) array.
+    """
+    joint_names = tuple(frames[0].get("data", {}))
+    times = tuple(frame.get("time", 0.0) for frame in frames)
+    angles = np.array([[frame.get("data", {}).get(joint, 0.0) for joint in joint_names] for frame in frames],
+                      dtype=float)
+    return times, joint_names, angles
+
+
+@lru_cache(maxsize=None)
+def _load_gesture_library():
+    """
+    Loads and parses the gesture library once.
+    """
+    try:
+        with open(GESTURE_FILE, "r") as f:
+            library = json.load(f)
+        logger.debug("Loaded gesture library with keys: %s", list(library.keys()))
+        return library
+    except Exception as e:
+        logger.error("Could not load gesture library: %s", e)
+        return {}
+
+
+@lru_cache(maxsize=None)
+def get_gesture_arrays(gesture_name):
+    """
+    Returns a library gesture as read-only (times, joint_names, angles) arrays (memoized per gesture),
+    an empty tuple if it has no keyframes, or None if the gesture is not in the library.
+    """
+    gesture = _load_gesture_library().get(gesture_name)
+    if gesture is None:
+        return None
+    frames = gesture.get("keyframes", [])
+    if not frames:
+        return ()
+    times, joint_names, angles = frames_to_arrays(frames)
+    angles.flags.writeable = False
+    return times, joint_names, angles
+
+
+def add_noise_to_frames(frame_arrays, angle_noise=0.05, frames=None):
+    """
+    Returns a list of frames with random noise added to every joint angle.
+    The frame times are kept as they are.
+
+    Args:
+        frame_arrays (tuple): (times, joint_names, angles) as returned by frames_to_arrays().
         angle_noise (float): Maximum noise to add/subtract from each joint angle.
+        frames (list, optional): Frames returned by an earlier call with the same frame_arrays;
+            their dicts are overwritten in place instead of building new ones.
 
     Returns:
         list: The list of noisy frames.
     """
-    noisy_frames = []
-    for frame in frames:
-        # Add noise to time and angles.
-        noisy_time = frame.get("time", 0.0) + random.uniform(-time_noise, time_noise)
-        noisy_data = {
-            joint: angle + random.uniform(-angle_noise, angle_noise)
-            for joint, angle in frame.get("data", {}).items()
-        }
-        noisy_frames.append({"time": frame.get("time", 0.0), "data": noisy_data})
-    return noisy_frames
+    times, joint_names, angles = frame_arrays
+    noisy_angles = (angles + _rng.uniform(-angle_noise, angle_noise, angles.shape)).tolist()
+    if frames is None:
+        return [
+            {"time": time_ms, "data": dict(zip(joint_names, row))}
+            for time_ms, row in zip(times, noisy_angles)
+        ]
+    for frame, time_ms, row in zip(frames, times, noisy_angles):
+        frame["time"] = time_ms  # perform_movement may have stretched it last time
+        frame["data"].update(zip(joint_names, row))
+    return frames
+
+
+def _signal_when_done(deferred):
+    """
+    Returns a Deferred that fires (with None) once `deferred` has fired, leaving its result untouched.
+    """
+    done = Deferred()
 
+    def _fire(result):
+        done.callback(None)
+        return result
 
-@inlineCallbacks
-def loop_gesture(session, frames, dialogue_deferred, start_time, estimated_duration):
+    deferred.addBoth(_fire)
+    return done
+
+
+async def loop_gesture(session, frame_arrays, dialogue_deferred, start_time, estimated_duration):
     """
     Repeatedly perform the given gesture (with noise) until the dialogue is finished
     or our estimated TTS time is exceeded.
+    The gesture is passed as the (times, joint_names, angles) arrays from get_gesture_arrays().
     """
     iteration = 0
+    noisy_frames = None  # Reused every iteration; the previous movement has been sent by then.
+    dialogue_done = _signal_when_done(dialogue_deferred)
     while not dialogue_deferred.called:
         elapsed = time.time() - start_time
         logger.debug("Loop gesture iteration %d; elapsed time: %.2f (estimated: %.2f)",
@@ -83,13 +151,13 @@ def loop_gesture(session, frames, dialogue_deferred, start_time, estimated_durat
 
 
         movement_duration = 2.0
-        noisy_frames = add_noise_to_frames(frames)
+        noisy_frames = add_noise_to_frames(frame_arrays, frames=noisy_frames)
 
         # (2) Start the motion in async mode if your library is truly asynchronous:
         perform_movement(session, noisy_frames, mode="linear", sync=False, force=False)
 
-        # (3) Wait for the motion to finish:
-        yield sleep(movement_duration)
+        # (3) Wait for the motion to finish, or stop as soon as the dialogue is done.
+        await DeferredList([sleep(movement_duration), dialogue_done], fireOnOneCallback=True)
 
     logger.debug("Exiting gesture loop after %d iterations.", iteration)
 
@@ -110,15 +178,17 @@ def say_animated(session, text, gesture_name=None):
     dialogue_deferred = session.call("rie.dialogue.say", text=text)
 
     # Estimate speech duration using a simple heuristic (0.4 sec per word)
-    word_count = len(text.split())
+    # Count the spaces instead of splitting, so no list of words is built just to be counted.
+    stripped = text.strip()
+    word_count = stripped.count(" ") + 1 if stripped else 0
     estimated_duration = word_count * 0.4
     logger.debug("Estimated speech duration: %.2f seconds", estimated_duration)
 
-    if gesture_name and gesture_name in GESTURE_LIBRARY:
-        gesture_frames = GESTURE_LIBRARY[gesture_name].get("keyframes", [])
-        if gesture_frames:
+    gesture_arrays = get_gesture_arrays(gesture_name) if gesture_name else None
+    if gesture_arrays is not None:
+        if gesture_arrays:
             logger.debug("Starting gesture loop for '%s'", gesture_name)
-            yield loop_gesture(session, gesture_frames, dialogue_deferred, start_time, estimated_duration)
+            yield ensureDeferred(loop_gesture(session, gesture_arrays, dialogue_deferred, start_time, estimated_duration))
         else:
             logger.warning("Gesture '%s' found but has no keyframes", gesture_name)
     else:
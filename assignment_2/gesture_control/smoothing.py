@@ -1,12 +1,43 @@
-import random
+import numpy as np
 
 
 def ease_in_out(t):
     """
     Ease-in-out interpolation function:
     Produces an S-curve from t=0 to t=1.
+    Works on a float or elementwise on a NumPy array (3t^2 - 2t^3 in Horner form).
     """
-    return 3 * (t ** 2) - 2 * (t ** 3)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _interpolate_segment(start_frame, end_frame, steps):
+    """
+    Computes the (steps - 1) intermediate frames between two keyframes in one NumPy pass:
+    ease-in-out timing, linear joint interpolation and a small random perturbation per joint.
+    Joints missing from end_frame keep their start value.
+
+    Returns:
+        list: intermediate frames with times and angles rounded to 3 decimals.
+    """
+    if steps < 2:
+        return []
+    start_data = start_frame["data"]
+    joints = list(start_data)
+    start_vals = np.array([start_data[j] for j in joints], dtype=float)
+    end_vals = np.array([end_frame["data"].get(j, start_data[j]) for j in joints], dtype=float)
+    start_time = float(start_frame["time"])
+    delta_time = float(end_frame["time"]) - start_time
+
+    t_smooth = ease_in_out(np.arange(1, steps) / float(steps))
+    times = np.round(start_time + delta_time * t_smooth, 3)
+    values = start_vals + (end_vals - start_vals) * t_smooth[:, None]
+    values += np.random.uniform(-0.005, 0.005, size=values.shape)
+    values = np.round(values, 3)
+
+    return [
+        {"time": new_time, "data": dict(zip(joints, row))}
+        for new_time, row in zip(times.tolist(), values.tolist())
+    ]
 
 
 def smooth_predefined_frames(keyframes, steps=2):
@@ -32,7 +63,6 @@ def smooth_predefined_frames(keyframes, steps=2):
         end_frame = keyframes[i + 1]
         start_time = float(start_frame["time"])
         end_time = float(end_frame["time"])
-        delta_time = end_time - start_time
 
         # Add the starting keyframe for the first pair.
         if i == 0:
@@ -42,25 +72,7 @@ def smooth_predefined_frames(keyframes, steps=2):
             })
 
         # Generate intermediate frames
-        for step_i in range(1, steps):
-            t = step_i / float(steps)
-            t_smooth = ease_in_out(t)
-            new_time = start_time + delta_time * t_smooth
-            new_time = round(new_time, 3)  # keep as float, just 3-decimal rounding
-
-            new_data = {}
-            for joint, start_val in start_frame["data"].items():
-                end_val = end_frame["data"].get(joint, start_val)
-                val = start_val + (end_val - start_val) * t_smooth
-                # Optionally add a small random perturbation:
-                val += random.uniform(-0.005, 0.005)
-                val = round(val, 3)
-                new_data[joint] = val
-
-            smoothed_frames.append({
-                "time": new_time,
-                "data": new_data
-            })
+        smoothed_frames.extend(_interpolate_segment(start_frame, end_frame, steps))
 
         # Append the original end keyframe, rounding to 3 decimals
         smoothed_frames.append({
@@ -89,7 +101,6 @@ def smooth_keyframes(keyframes, steps=1):
         end_frame = keyframes[i + 1]
         start_time = float(start_frame["time"])
         end_time = float(end_frame["time"])
-        delta_time = end_time - start_time
 
         # Add the starting frame for the first segment.
         if i == 0:
@@ -99,24 +110,7 @@ def smooth_keyframes(keyframes, steps=1):
             })
 
         # Generate intermediate frames
-        for step_i in range(1, steps):
-            t = step_i / float(steps)
-            t_smooth = ease_in_out(t)
-            new_time = start_time + delta_time * t_smooth
-            new_time = round(new_time, 3)
-
-            new_data = {}
-            for joint, start_val in start_frame["data"].items():
-                end_val = end_frame["data"].get(joint, start_val)
-                val = start_val + (end_val - start_val) * t_smooth
-                val += random.uniform(-0.005, 0.005)
-                val = round(val, 3)
-                new_data[joint] = val
-
-            smoothed_frames.append({
-                "time": new_time,
-                "data": new_data
-            })
+        smoothed_frames.extend(_interpolate_segment(start_frame, end_frame, steps))
 
         # Append the end frame (rounded)
         smoothed_frames.append({
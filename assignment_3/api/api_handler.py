@@ -1,43 +1,162 @@
 # /api/api_handler.py
+import os
 import re
+import json
+import io
+import heapq
+import base64
+import random
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from functools import lru_cache
+import httpx
 from openai import OpenAI
+from PIL import Image
 from .conn import chat_gtp_connection
-from .give_hint import give_hint
-import random
+from .give_hint import give_hint, pick_hint, request_hint_options, reset_hint_variants
 
 logger = logging.getLogger(__name__)
 
+# Matches the question between the <<< and >>> delimiters in a guess response.
+_TRIPLE_ANGLE_RE = re.compile(r'<<<(.*?)>>>', re.DOTALL)
+
+# Name fragments of simple objects, favoured on easy difficulty; the pattern finds any of them in one pass.
+_SIMPLE_OBJECTS = frozenset({'ball', 'bottle', 'cup', 'book', 'toy', 'pen'})
+_SIMPLE_OBJECTS_RE = re.compile("|".join(sorted(_SIMPLE_OBJECTS)))
+
+# Name fragments of everyday objects, avoided on medium (furniture) and hard (all of them) difficulty;
+# the patterns find any of them in one pass.
+_FURNITURE = frozenset({'chair', 'table', 'desk'})
+_EVERYDAY_OBJECTS = _FURNITURE | {'bottle', 'cup', 'book', 'monitor', 'keyboard'}
+_FURNITURE_RE = re.compile("|".join(sorted(_FURNITURE)))
+_EVERYDAY_OBJECTS_RE = re.compile("|".join(sorted(_EVERYDAY_OBJECTS)))
+
+# Colors that do not count as vivid.
+_DULL_COLORS = frozenset({'black', 'gray', 'white', 'brown', 'unknown'})
+
+# Values substituted for features the model reported as 'unknown'.
+_FEATURE_DEFAULTS = {'color': 'multicolored', 'size': 'medium', 'shape': 'irregular'}
+
+# Structured output format for choose_object: the model can only return an object with exactly these fields.
+_OBJECT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "spy_object",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "dutch_name": {"type": "string"},
+                "confidence": {"type": "number"},
+                "position_id": {"type": "string"},
+                "features": {
+                    "type": "object",
+                    "properties": {
+                        "color": {"type": "string"},
+                        "size": {"type": "string"},
+                        "shape": {"type": "string"}
+                    },
+                    "required": ["color", "size", "shape"],
+                    "additionalProperties": False
+                }
+            },
+            "required": ["name", "dutch_name", "confidence", "position_id", "features"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Directory the scanning routine saves its annotated images to.
+SCAN_IMAGE_DIR = "scan_images"
+
+# Longest side, in pixels, of a scan image sent to the API; the model does not need more detail to name a color.
+SCAN_IMAGE_MAX_SIDE = 512
+
+# Worker threads for API calls made speculatively alongside another call; also bounds their concurrency.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api")
+
+# Matches the word on one line of the secret word list (drops numbering and punctuation).
+_WORD_RE = re.compile(r'[A-Za-z]+')
+
+# Number of secret words generated per API call, and the queue size below which a background refill starts.
+SECRET_WORD_BATCH = 20
+SECRET_WORD_LOW_WATER = 5
+
+# Secret words generated ahead of time; the lock keeps concurrent refills from both calling the API.
+_word_queue = deque()
+_refill_lock = threading.Lock()
+
+# Matches the characters dropped when normalizing a question for the answer cache.
+_NON_WORD_RE = re.compile(r'[^\w ]+')
+
+# Similarity from which words in a guess count as the object's name without asking the API (typos, plurals).
+# Only spellings with the same first letter and a length within one of the name's qualify, and a length
+# difference must come from letters added at the end, so different words ("lock", "planet") go to the judge.
+FUZZY_MATCH_RATIO = 0.85
+
+# Shared OpenAI client, created on first use so every call reuses the same HTTP connection pool.
+# API calls run in worker threads, so creating it is locked.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """
+    Returns the shared OpenAI client, creating it the first time it is needed.
+    Its HTTP pool keeps connections to the API alive between calls, so the TLS handshake
+    is not repeated for every question, hint and guess check.
+
+    :return: The shared client
+    :rtype: OpenAI
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_client = httpx.Client(
+                    timeout=httpx.Timeout(30.0, connect=5.0),
+                    limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0)
+                )
+                _client = OpenAI(api_key=chat_gtp_connection(), http_client=http_client)
+    return _client
+
+
 def build_prompt(previous_guesses, last_user_input):
     """
     Build the prompt using previous rounds and the latest user response.
     The output should be delimited by <<< and >>>.
     """
-    prompt = (
+    parts = [
         "You are a guessing game assistant. The player is thinking of a word, "
         "and your goal is to guess it by asking yes/no questions. "
         "Use the feedback from previous rounds to refine your questions.\n\n"
         "Previous rounds:\n"
-    )
+    ]
     if previous_guesses:
-        for idx, entry in enumerate(previous_guesses, start=1):
-            prompt += f"{idx}. Question: {entry['guess']} | Feedback: {entry['feedback']}\n"
+        parts.extend(
+            f"{idx}. Question: {entry['guess']} | Feedback: {entry['feedback']}\n"
+            for idx, entry in enumerate(previous_guesses, start=1)
+        )
     else:
-        prompt += "None\n"
+        parts.append("None\n")
     if last_user_input:
-        prompt += f"\nThe latest user response was: \"{last_user_input}\"\n"
-    prompt += (
+        parts.append(f"\nThe latest user response was: \"{last_user_input}\"\n")
+    parts.append(
         "\nBased on this context, propose your next yes/no question to narrow down the word. "
         "Output only the question enclosed between <<< and >>>. For example:\n"
         "<<<Is it an animal?>>>\n"
     )
-    return prompt
+    return "".join(parts)
 
 def parse_response(response_text):
     """
     Extracts the text between <<< and >>>. If not found, returns the full response.
     """
-    match = re.search(r'<<<(.*?)>>>', response_text, re.DOTALL)
+    match = _TRIPLE_ANGLE_RE.search(response_text)
     if match:
         return match.group(1).strip()
     return response_text.strip()
@@ -48,8 +167,7 @@ def guess(last_user_input, previous_guesses):
     Silences extra HTTP debugging and handles errors.
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
+        client = _get_client()
         prompt = build_prompt(previous_guesses, last_user_input)
         logger.debug("Built prompt for guess: %s", prompt)
         response = client.chat.completions.create(
@@ -66,69 +184,241 @@ def guess(last_user_input, previous_guesses):
         return "I'm sorry, I couldn't generate a question."
 
 
+@lru_cache(maxsize=256)
+def _answer_cached(chosen_word, question):
+    """
+    Asks ChatGPT for the yes/no answer to a normalized question about the chosen word.
+    Cached, so a repeated question is answered without another API call; errors are raised, not cached.
+    """
+    client = _get_client()
+    prompt = (
+        f"The secret word is '{chosen_word}'.\n"
+        f"Answer the following question with only 'yes' or 'no':\n"
+        f"Question: {question}\n"
+    )
+    logger.debug("Built prompt for answer: %s", prompt)
+    # "yes" and "no" are single tokens, so one is enough; the fixed seed keeps repeated answers stable.
+    # Streamed, so the answer is returned as soon as "yes" or "no" has arrived.
+    stream = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model="gpt-4o-mini",
+        max_tokens=1,
+        temperature=0,
+        seed=0,
+        stream=True
+    )
+    raw_response = ""
+    answer = "I don't know"
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            raw_response += (chunk.choices[0].delta.content or "").lower()
+            if "yes" in raw_response:
+                answer = "yes"
+                break
+            elif "no" in raw_response:
+                answer = "no"
+                break
+    finally:
+        stream.close()
+    logger.debug("Raw answer response: %s", raw_response.strip())
+    return answer
+
+
 def answer_question_with_api(chosen_word, question):
     """
     Uses the ChatGPT API to answer a yes/no question about the chosen word.
     The prompt tells the model the secret word and asks it to respond only "yes" or "no."
+    Questions are compared ignoring case, punctuation and extra whitespace, so a repeated
+    question gets the earlier answer straight away.
 
     :param chosen_word: The secret word.
     :param question: The user's yes/no question.
     :return: "yes" or "no" (or "I don't know" on error).
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-        prompt = (
-            f"The secret word is '{chosen_word}'.\n"
-            f"Answer the following question with only 'yes' or 'no':\n"
-            f"Question: {question}\n"
-        )
-        logger.debug("Built prompt for answer: %s", prompt)
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gpt-4o-mini",
-            max_tokens=20,
-            temperature=0
-        )
-        raw_response = response.choices[0].message.content.strip().lower()
-        logger.debug("Raw answer response: %s", raw_response)
-        if "yes" in raw_response:
-            return "yes"
-        elif "no" in raw_response:
-            return "no"
-        else:
-            return "I don't know"
+        return _answer_cached(chosen_word, " ".join(_NON_WORD_RE.sub(" ", question.lower()).split()))
     except Exception as e:
         logger.error("Error in answer_question_with_api: %s", e)
         return "I don't know"
 
 
+def clear_answer_cache():
+    """
+    Forgets the answers given so far, so a new game starts with an empty answer cache.
+    """
+    _answer_cached.cache_clear()
+
+
+def _refill_words(n=SECRET_WORD_BATCH):
+    """
+    Uses the ChatGPT API to generate `n` simple secret words in one call and adds them to the word queue.
+    Errors are logged; the queue is then left as it was.
+    """
+    with _refill_lock:
+        if len(_word_queue) >= SECRET_WORD_LOW_WATER:
+            return  # Another thread refilled the queue while we were waiting.
+        try:
+            client = _get_client()
+            prompt = (
+                f"Please list {n} different simple, common English words (preferably 4-8 letters) that are not "
+                "too complex. Output only the words, one per line."
+            )
+            logger.debug("Built prompt for secret words: %s", prompt)
+            response = client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                model="gpt-4o-mini",
+                max_tokens=n * 5,
+                temperature=1.0
+            )
+            words = [_WORD_RE.search(line) for line in response.choices[0].message.content.splitlines()]
+            words = [match.group(0).lower() for match in words if match]
+            _word_queue.extend(words)
+            logger.debug("Generated secret words: %s", words)
+        except Exception as e:
+            logger.error("Error in generate_secret_word: %s", e)
+
+
 def generate_secret_word():
     """
-    Uses the ChatGPT API to generate a simple secret word.
-    The prompt instructs the model to choose one common word.
+    Returns a simple secret word from the queue of words generated by ChatGPT.
+    The queue is filled SECRET_WORD_BATCH words at a time: synchronously when it is empty,
+    and in a background thread once it runs low, so the next game does not wait for the API.
     """
-    try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-        prompt = (
-            "Please choose one simple, common English word (preferably 4-8 letters) that is not too complex, "
-            "and output only the word."
-        )
-        logger.debug("Built prompt for secret word: %s", prompt)
-        response = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="gpt-4o-mini",
-            max_tokens=10,
-            temperature=0.5
-        )
-        word = response.choices[0].message.content.strip().lower()
-        logger.debug("Generated secret word: %s", word)
-        return word
-    except Exception as e:
-        logger.error("Error in generate_secret_word: %s", e)
-        # Fallback to a random word from a hardcoded list.
+    if not _word_queue:
+        _refill_words()
+    if not _word_queue:
+        # Fallback when no words could be generated.
         return "apple"
+    word = _word_queue.popleft()
+    if len(_word_queue) < SECRET_WORD_LOW_WATER:
+        threading.Thread(target=_refill_words, daemon=True).start()
+    logger.debug("Chosen secret word: %s", word)
+    return word
+
+
+def _slim_objects(candidates):
+    """
+    Serializes the candidate objects for the selection prompt, keeping only the fields the model needs
+    (name, rounded confidence, position and known features) to keep the prompt short.
+
+    :param candidates: (obj_id, obj_data, score) tuples
+    :type candidates: list
+    :return: Compact JSON string mapping object ids to their slim description
+    :rtype: str
+    """
+    slim = {}
+    for obj_id, obj_data, _ in candidates:
+        features = {k: v for k, v in obj_data.get('features', {}).items() if v != 'unknown'}
+        slim[obj_id] = {
+            'name': obj_data.get('name'),
+            'confidence': round(obj_data.get('confidence', 0), 2),
+            'position_id': obj_data.get('position_id'),
+        }
+        if features:
+            slim[obj_id]['features'] = features
+    return json.dumps(slim, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1)
+def _list_scan_images(dir_mtime):
+    """
+    Lists the .jpg files in SCAN_IMAGE_DIR. Cached on the directory's modification time,
+    so the listing is only read again after a scan has added images.
+
+    :param dir_mtime: Modification time of SCAN_IMAGE_DIR (cache key)
+    :type dir_mtime: int
+    :return: Sorted file names
+    :rtype: tuple
+    """
+    with os.scandir(SCAN_IMAGE_DIR) as entries:
+        return tuple(sorted(entry.name for entry in entries if entry.name.endswith(".jpg")))
+
+
+def _find_scan_image(position_id, name):
+    """
+    Finds a scan image taken at the given position that shows the named object
+    (file name "pos_<position_id>...<name>....jpg").
+
+    :param position_id: Position the object was detected at (e.g., '2_left')
+    :type position_id: str
+    :param name: Object name
+    :type name: str
+    :return: Path of the image, or None if there is none
+    :rtype: str or None
+    """
+    try:
+        dir_mtime = os.stat(SCAN_IMAGE_DIR).st_mtime_ns
+    except OSError:
+        return None
+    prefix = f"pos_{position_id}"
+    for filename in _list_scan_images(dir_mtime):
+        if filename.startswith(prefix) and name in filename[len(prefix):]:
+            return os.path.join(SCAN_IMAGE_DIR, filename)
+    return None
+
+
+@lru_cache(maxsize=16)
+def _encode_scan_image(image_path):
+    """
+    Base64-encode a scan image as JPEG, downscaled to at most SCAN_IMAGE_MAX_SIDE pixels.
+    Small JPEG files are encoded as they are, without decoding them.
+    Cached per path; scan images are saved under new, timestamped names, so a path never changes content.
+
+    :param image_path: Path of the scan image
+    :type image_path: str
+    :return: Base64 encoded JPEG
+    :rtype: str
+    """
+    with Image.open(image_path) as image:
+        if image.format == "JPEG" and max(image.size) <= SCAN_IMAGE_MAX_SIDE:
+            with open(image_path, "rb") as img_file:
+                return base64.b64encode(img_file.read()).decode('ascii')
+        image.thumbnail((SCAN_IMAGE_MAX_SIDE, SCAN_IMAGE_MAX_SIDE))
+        buffered = io.BytesIO()
+        image.convert("RGB").save(buffered, format="JPEG", quality=85)
+    return base64.b64encode(buffered.getbuffer()).decode('ascii')
+
+
+def _read_json_object(stream):
+    """
+    Reads a streamed completion until the first top-level JSON object in it is complete,
+    then closes the stream without waiting for the rest of the response.
+
+    :param stream: Streamed chat completion
+    :type stream: openai.Stream
+    :return: The response text received up to the end of the object
+    :rtype: str
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            parts.append(text)
+            for char in text:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif depth and char == '"':
+                    in_string = True
+                elif char == "{":
+                    depth += 1
+                elif char == "}" and depth:
+                    depth -= 1
+                    if not depth:
+                        return "".join(parts)
+    finally:
+        stream.close()
+    return "".join(parts)
 
 
 def choose_object(objects: dict, difficulty: int):
@@ -142,26 +432,17 @@ def choose_object(objects: dict, difficulty: int):
     :return: dict with detailed object information
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-
-        # Filter to keep only ChatGPT-detected objects for detailed descriptions
-        chatgpt_objects = {k: v for k, v in objects.items() if v.get('source') == 'chatgpt'}
-
-        if not chatgpt_objects:
-            logger.warning("No ChatGPT-detected objects available for selection")
-            return None
+        client = _get_client()
 
-        # Define priority lists for object names and colors
-        simple_objects = ['ball', 'bottle', 'cup', 'book', 'toy', 'pen']
-        dull_colors = ['black', 'gray', 'white', 'brown', 'unknown']
-
-        # Select candidates with a relaxed confidence threshold of 0.75
+        # Select candidates with a relaxed confidence threshold of 0.75, keeping only
+        # ChatGPT-detected objects for detailed descriptions
+        has_chatgpt_objects = False
         candidates = []
-        for obj_id, obj_data in chatgpt_objects.items():
+        for obj_id, obj_data in objects.items():
+            if obj_data.get('source') != 'chatgpt':
+                continue
+            has_chatgpt_objects = True
             obj_name = obj_data.get('name', '').lower()
-            features = obj_data.get('features', {})
-            color = features.get('color', 'unknown').lower()
             confidence = obj_data.get('confidence', 0)
 
             # Only include objects with confidence >= 0.75
@@ -169,20 +450,22 @@ def choose_object(objects: dict, difficulty: int):
                 logger.debug(f"Excluding {obj_name} due to low confidence: {confidence}")
                 continue
 
+            color = obj_data.get('features', {}).get('color', 'unknown').lower()
+
             # Assign a score based on difficulty and object characteristics
             score = 0
             if difficulty == 1:  # Easy: prioritize vivid, colorful, simple objects
-                if any(simple in obj_name for simple in simple_objects):
+                if _SIMPLE_OBJECTS_RE.search(obj_name):
                     score += 2  # Higher priority for simple, engaging objects
-                if color not in dull_colors:
+                if color not in _DULL_COLORS:
                     score += 1  # Boost for vivid colors
             elif difficulty == 2:  # Medium: moderately complex objects
-                if not any(simple in obj_name for simple in ['chair', 'table', 'desk']):
+                if not _FURNITURE_RE.search(obj_name):
                     score += 1
-                if color not in dull_colors:
+                if color not in _DULL_COLORS:
                     score += 1
             else:  # Hard: complex or unusual objects
-                if not any(simple in obj_name for simple in ['chair', 'table', 'bottle', 'cup', 'book', 'desk', 'monitor', 'keyboard']):
+                if not _EVERYDAY_OBJECTS_RE.search(obj_name):
                     score += 1
 
             candidates.append((obj_id, obj_data, score))
@@ -190,31 +473,23 @@ def choose_object(objects: dict, difficulty: int):
         # Log all candidates for debugging
         logger.debug("All candidates with scores: %s", [(obj_id, obj_data['name'], score) for obj_id, obj_data, score in candidates])
 
-        # If no candidates meet criteria, relax constraints for difficulty 1
-        if not candidates and difficulty == 1:
-            logger.debug("No candidates found, relaxing constraints for difficulty 1")
-            for obj_id, obj_data in chatgpt_objects.items():
-                confidence = obj_data.get('confidence', 0)
-                if confidence >= 0.75:
-                    candidates.append((obj_id, obj_data, 1))  # Default score of 1
-
+        if not has_chatgpt_objects:
+            logger.warning("No ChatGPT-detected objects available for selection")
+            return None
         if not candidates:
-            logger.warning("No suitable candidates found even with relaxed constraints")
+            logger.warning("No suitable candidates found")
             return None
 
-        # Sort by confidence and take top 5 (or fewer if less than 5 candidates)
-        candidates.sort(key=lambda x: x[1].get('confidence', 0), reverse=True)
-        top_candidates = candidates[:min(5, len(candidates))]
+        # Take the top 5 by confidence (or fewer if less than 5 candidates) without sorting them all
+        top_candidates = heapq.nlargest(5, candidates, key=lambda x: x[1].get('confidence', 0))
 
         # Log top candidates
         logger.debug("Top 5 candidates: %s", [(obj_id, obj_data['name'], score) for obj_id, obj_data, score in top_candidates])
 
-        # Weighted random selection from top candidates based on scores
-        total_score = sum(score for _, _, score in top_candidates)
-        if total_score > 0:  # Avoid division by zero
-            selection_weights = [score / total_score for _, _, score in top_candidates]
-        else:
-            selection_weights = [1 / len(top_candidates)] * len(top_candidates)  # Equal weights if no scores
+        # Weighted random selection from top candidates based on scores (random.choices normalizes them)
+        selection_weights = [score for _, _, score in top_candidates]
+        if not any(selection_weights):
+            selection_weights = None  # Equal weights if no scores
 
         selected_candidate = random.choices(top_candidates, weights=selection_weights, k=1)[0]
         selected_obj_id, selected_obj_data, selected_score = selected_candidate
@@ -229,16 +504,12 @@ def choose_object(objects: dict, difficulty: int):
         name = selected_obj_data.get('name')
 
         if position_id and name:
-            import glob
-            possible_images = glob.glob(f"scan_images/pos_{position_id}*{name}*.jpg")
-            if possible_images:
-                image_path = possible_images[0]
+            image_path = _find_scan_image(position_id, name)
+            if image_path:
                 logger.info(f"Found image for object: {image_path}")
                 try:
-                    import base64
-                    with open(image_path, "rb") as img_file:
-                        image_base64 = base64.b64encode(img_file.read()).decode('utf-8')
-                        has_image = True
+                    image_base64 = _encode_scan_image(image_path)
+                    has_image = True
                 except Exception as e:
                     logger.error(f"Error encoding image: {e}")
 
@@ -273,17 +544,11 @@ def choose_object(objects: dict, difficulty: int):
                     ]
                 }
             ]
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                max_tokens=400,
-                temperature=0.3
-            )
         else:
             logger.info("Using text-based analysis for object selection")
             prompt = (
                 f"I need to choose an object for an 'I Spy' game for difficulty level {difficulty} (1=easy, 3=hard). "
-                f"Detected objects: {dict((obj_id, obj_data) for obj_id, obj_data, _ in top_candidates)}\n\n"
+                f"Detected objects: {_slim_objects(top_candidates)}\n\n"
                 f"Select ONE object, prioritizing:\n"
                 f"- Difficulty 1 (easy): Simple, vivid objects (e.g., bright colors like red, green, blue; unique shapes) for young players\n"
                 f"- Difficulty 2 (medium): Moderately complex objects with distinct features\n"
@@ -300,47 +565,48 @@ def choose_object(objects: dict, difficulty: int):
                 f"ONLY return the JSON."
             )
             messages = [{"role": "user", "content": prompt}]
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                max_tokens=400,
-                temperature=0.3
-            )
+
+        # The schema makes the response a single JSON object with the expected fields; it is streamed
+        # so it can be parsed as soon as the object is complete
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            max_tokens=200,
+            temperature=0.3,
+            response_format=_OBJECT_RESPONSE_FORMAT,
+            stream=True
+        )
 
         # Parse response
-        response_text = response.choices[0].message.content.strip()
-        import re
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            import json
-            detailed_object = json.loads(json_match.group(0))
-            logger.debug("Selected object details: %s", detailed_object)
-
-            # Add missing fields
-            object_name = detailed_object.get('name')
-            for obj_id, obj_data in chatgpt_objects.items():
-                if obj_data.get('name').lower() == object_name.lower():
-                    for key in ['yaw', 'pitch', 'turn', 'cumulative_rotation', 'orientation', 'position_id']:
-                        if key in obj_data and key not in detailed_object:
-                            detailed_object[key] = obj_data[key]
-                    break
-
-            # Ensure specific features
-            features = detailed_object.get('features', {})
-            if any(features.get(k) == 'unknown' for k in ['color', 'size', 'shape']):
-                if features.get('color') == 'unknown':
-                    features['color'] = 'multicolored'
-                if features.get('size') == 'unknown':
-                    features['size'] = 'medium'
-                if features.get('shape') == 'unknown':
-                    features['shape'] = 'irregular'
-                detailed_object['features'] = features
-
-            detailed_object['features_from_image'] = has_image
-            return detailed_object
-        else:
+        response_text = _read_json_object(stream).strip()
+        try:
+            detailed_object = json.loads(response_text)
+        except ValueError:
             logger.error("No JSON in response: %s", response_text)
             return None
+        logger.debug("Selected object details: %s", detailed_object)
+
+        # Add missing fields from the detection the model described: the selected object on the image path,
+        # the candidate it picked by name on the text path
+        obj_data = selected_obj_data
+        if not has_image:
+            object_name = (detailed_object.get('name') or '').lower()
+            obj_data = next((candidate for _, candidate, _ in top_candidates
+                             if candidate.get('name', '').lower() == object_name), None)
+        if obj_data:
+            for key in ('yaw', 'pitch', 'turn', 'cumulative_rotation', 'orientation', 'position_id'):
+                if key in obj_data:
+                    detailed_object.setdefault(key, obj_data[key])
+
+        # Ensure specific features
+        features = detailed_object.get('features', {})
+        for key, default in _FEATURE_DEFAULTS.items():
+            if features.get(key) == 'unknown':
+                features[key] = default
+        detailed_object['features'] = features
+
+        detailed_object['features_from_image'] = has_image
+        return detailed_object
 
     except Exception as e:
         logger.error("Error in choose_object: %s", e)
@@ -368,13 +634,99 @@ def start_i_spy_game(game_object, difficulty=1):
     else:
         intro = "I challenge you to a difficult game of I Spy. See if you can guess what I'm thinking of."
 
+    # A new game starts at the first variant of every generated hint
+    reset_hint_variants()
+
     # Generate the initial hint
     initial_hint = give_hint(game_object, difficulty, 0, [], is_initial_hint=True)
 
     return intro, initial_hint
 
 
-def process_guess(guess, game_object, round_num, previous_hints):
+def _fuzzy_match(guess, names):
+    """
+    Check whether any run of words in the guess is nearly identical to one of the names:
+    a typo of the same length, or the name with one letter added or dropped at the end (plurals).
+
+    :param guess: The lower-cased guess
+    :type guess: str
+    :param names: Lower-cased, non-empty names of the target object
+    :type names: list
+    :return: True if a run of words reaches FUZZY_MATCH_RATIO similarity with a name
+    :rtype: bool
+    """
+    guess_words = _NON_WORD_RE.sub(" ", guess).split()
+    for name in names:
+        width = name.count(" ") + 1
+        for i in range(len(guess_words) - width + 1):
+            candidate = " ".join(guess_words[i:i + width])
+            if candidate[0] != name[0] or abs(len(candidate) - len(name)) > 1:
+                continue
+            if len(candidate) != len(name) and not (candidate.startswith(name) or name.startswith(candidate)):
+                continue
+            matcher = SequenceMatcher(None, candidate, name)
+            # The quick ratios are upper bounds, so most words are rejected without the full comparison.
+            if (matcher.real_quick_ratio() >= FUZZY_MATCH_RATIO and matcher.quick_ratio() >= FUZZY_MATCH_RATIO
+                    and matcher.ratio() >= FUZZY_MATCH_RATIO):
+                return True
+    return False
+
+
+@lru_cache(maxsize=256)
+def _judge_guess(object_name, dutch_name, guess):
+    """
+    Ask ChatGPT whether a guess is close enough to the target object to count as correct.
+    Cached, so a repeated guess is judged without another API call; errors are raised, not cached.
+
+    :param object_name: Lower-cased English name of the target object
+    :type object_name: str
+    :param dutch_name: Lower-cased Dutch name of the target object
+    :type dutch_name: str
+    :param guess: The normalized guess
+    :type guess: str
+    :return: True if the guess counts as correct
+    :rtype: bool
+    """
+    client = _get_client()
+    prompt = (
+        f"In an 'I Spy' game, the target object is: '{object_name}' (Dutch: '{dutch_name}'). "
+        f"The player guessed: '{guess}'.\n\n"
+        f"Determine if the player's guess is close enough to be considered correct. "
+        f"Answer with ONLY 'yes' or 'no'."
+    )
+
+    response = client.chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        model="gpt-4o-mini",
+        max_tokens=1,
+        temperature=0,
+        seed=0
+    )
+
+    answer = response.choices[0].message.content.strip().lower()
+    return 'yes' in answer
+
+
+def prefetch_hint(game_object, round_num, previous_hints):
+    """
+    Start generating the hint that follows round `round_num` in the background,
+    so it can be ready by the time the player's guess for that round has been heard.
+    The API call is made even if the guess turns out to be right; the result is then simply unused.
+
+    :param game_object: The object to be guessed
+    :type game_object: dict
+    :param round_num: Current round number
+    :type round_num: int
+    :param previous_hints: Previous hints given
+    :type previous_hints: list
+    :return: Future resolving to the next hint's options, to be passed to process_guess
+    :rtype: concurrent.futures.Future
+    """
+    return _executor.submit(request_hint_options, game_object, difficulty=game_object.get('difficulty', 1),
+                            round_num=round_num + 1, previous_hints=list(previous_hints))
+
+
+def process_guess(guess, game_object, round_num, previous_hints, hint_future=None):
     """
     Process a player's guess in the I Spy game.
 
@@ -386,44 +738,30 @@ def process_guess(guess, game_object, round_num, previous_hints):
     :type round_num: int
     :param previous_hints: Previous hints given
     :type previous_hints: list
+    :param hint_future: Next hint started with prefetch_hint() for this round, if any
+    :type hint_future: concurrent.futures.Future or None
     :return: Response to the guess and whether it was correct
     :rtype: tuple(str, bool)
     """
     try:
-        api_key = chat_gtp_connection()
-        client = OpenAI(api_key=api_key)
-
         # Extract target object information
         object_name = game_object.get('name', '').lower()
         dutch_name = game_object.get('dutch_name', '').lower()
         guess = guess.lower()
 
-        # Direct match check
-        is_correct = (
-                guess == object_name or
-                guess == dutch_name or
-                object_name in guess or
-                dutch_name in guess
-        )
-
-        # For less obvious matches, use the API
-        if not is_correct and (len(guess) > 3):  # Only for substantial guesses
-            prompt = (
-                f"In an 'I Spy' game, the target object is: '{object_name}' (Dutch: '{dutch_name}'). "
-                f"The player guessed: '{guess}'.\n\n"
-                f"Determine if the player's guess is close enough to be considered correct. "
-                f"Answer with ONLY 'yes' or 'no'."
-            )
-
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="gpt-4o-mini",
-                max_tokens=10,
-                temperature=0.3
-            )
+        # Direct match check, then a local fuzzy match that catches typos and plurals
+        names = [name for name in (object_name, dutch_name) if name]
+        is_correct = any(name in guess for name in names) or _fuzzy_match(guess, names)
 
-            answer = response.choices[0].message.content.strip().lower()
-            is_correct = is_correct or ('yes' in answer)
+        # For less obvious matches, use the API; punctuation and extra spaces from STT do not count
+        # towards a substantial guess
+        normalized_guess = " ".join(_NON_WORD_RE.sub(" ", guess).split())
+        if not is_correct and (len(normalized_guess) > 3):  # Only for substantial guesses
+            # Start on the next hint while the guess is judged. If the guess is right, its API call is
+            # wasted; the options are only generated, so an unused prefetch does not affect later hints.
+            if hint_future is None:
+                hint_future = prefetch_hint(game_object, round_num, previous_hints)
+            is_correct = _judge_guess(object_name, dutch_name, normalized_guess)
 
         # Generate appropriate response based on correctness
         if is_correct:
@@ -433,12 +771,14 @@ def process_guess(guess, game_object, round_num, previous_hints):
                 f"You got it! It's the {object_name}!",
                 f"Well done! You guessed it - the {object_name}!"
             ]
-            import random
             return random.choice(responses), True
         else:
             # Generate a new hint for the next round
-            next_hint = give_hint(game_object, difficulty=game_object.get('difficulty', 1),
-                                  round_num=round_num + 1, previous_hints=previous_hints)
+            if hint_future:
+                next_hint = pick_hint(hint_future.result())
+            else:
+                next_hint = give_hint(game_object, difficulty=game_object.get('difficulty', 1),
+                                      round_num=round_num + 1, previous_hints=previous_hints)
 
             responses = [
                 f"No, that's not it. Here's another hint: {next_hint}",
@@ -446,7 +786,6 @@ def process_guess(guess, game_object, round_num, previous_hints):
                 f"Not quite! Here's a new clue: {next_hint}",
                 f"That's not it. Try again! Hint: {next_hint}"
             ]
-            import random
             return random.choice(responses), False
 
     except Exception as e:
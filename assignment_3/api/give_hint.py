@@ -1,10 +1,110 @@
 # /api/give_hint.py
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from openai import OpenAI
 from .conn import chat_gtp_connection
 
 logger = logging.getLogger(__name__)
 
+# Fallback hint templates per difficulty, one per round (the last one repeats); filled in with the object's features.
+_FALLBACK_HINTS = {
+    1: (
+        "It is {color} in color.",
+        "It is {size} in size.",
+        "It has a {shape} shape.",
+        "You might use this object every day.",
+        "Look around the room carefully."
+    ),
+    2: (
+        "This object is used for a specific purpose.",
+        "You might find this in many homes or offices.",
+        "Think about objects that are {size}.",
+        "This object has a specific function.",
+        "It's something you might interact with regularly."
+    ),
+    3: (
+        "This object serves a purpose that helps people.",
+        "Look beyond the obvious things in the room.",
+        "Consider objects you might take for granted.",
+        "This object has been around for quite some time.",
+        "Think about what you use in your daily activities."
+    )
+}
+
+# Hint requirements for round 1, round 2 and later rounds ({round} is filled in with the round number).
+_ROUND_RULES = (
+    "\n- Is in English only"
+    "\n- Mentions the color of the object"
+    "\n- Is clear and straightforward for all players",
+    "\n- Is in Dutch only, enclosed in <nl>...</nl> tags"
+    "\n- Mentions the shape of the object"
+    "\n- Uses simple Dutch vocabulary"
+    "\n- Avoids contextual clues (e.g., usage or location)",
+    "\n- Is bilingual: first in Dutch (in <nl>...</nl> tags), then in English"
+    "\n- Mentions a feature like size or another attribute"
+    "\n- Avoids contextual clues in early rounds"
+    "\n- Gets more specific as rounds progress (this is round {round})"
+)
+
+# Hint requirements per difficulty.
+_DIFFICULTY_RULES = {
+    1: "\n- Is suitable for younger players"
+       "\n- Makes the object fairly easy to guess by round 3",
+    2: "\n- Is moderately challenging but fair"
+       "\n- Requires some thinking",
+    3: "\n- Is challenging with indirect references"
+       "\n- Requires creative thinking"
+}
+
+# Complete hint rubric per (difficulty, round bucket), assembled once so building a prompt is a single lookup.
+_RUBRIC = {
+    (difficulty, round_bucket): (
+        "Please generate a single hint for this round that:"
+        + round_rules
+        + difficulty_rules
+        + "\n\nYour response should be just the hint itself - no explanations."
+          "\nThe hint should be ONE sentence, simple enough for a robot to speak."
+          "\nDo not reveal the object directly."
+    )
+    for difficulty, difficulty_rules in _DIFFICULTY_RULES.items()
+    for round_bucket, round_rules in enumerate(_ROUND_RULES)
+}
+
+# Number of most recent previous hints included in the hint prompt, so it does not grow every round.
+PROMPT_HINT_HISTORY = 4
+
+# Number of hints generated per API call; repeated requests for the same game state take the next one.
+HINT_VARIANTS = 3
+
+# Number of hints already given per prompt, used to pick the next variant; bounded like the hint cache.
+# Hints are requested from several threads, so it is only read and updated under its lock.
+_VARIANTS_SERVED_MAX = 128
+_variants_served = OrderedDict()
+_variants_lock = threading.Lock()
+
+# Shared OpenAI client, created on first use so every hint reuses the same HTTP connection pool.
+# Hints are requested from several threads (prefetching and reprompts), so creating it is locked.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """
+    Return the shared OpenAI client, creating it the first time it is needed.
+
+    :return: The shared client
+    :rtype: OpenAI
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=chat_gtp_connection())
+    return _client
+
+
 def give_hint(game_object, difficulty, round_num, previous_hints=None, is_initial_hint=False):
     """
     Generates a hint for the I Spy game based on the current game state.
@@ -17,18 +117,52 @@ def give_hint(game_object, difficulty, round_num, previous_hints=None, is_initia
     :return: Hint string tailored to the round and difficulty
     :rtype: str
     """
-    if previous_hints is None:
-        previous_hints = []
-
     if is_initial_hint:
         return _initial_hint(difficulty, game_object)
 
+    return pick_hint(request_hint_options(game_object, difficulty, round_num, previous_hints))
+
+
+def request_hint_options(game_object, difficulty, round_num, previous_hints=None):
+    """
+    Generates the candidate hints for the current game state without choosing one, so hints can be
+    requested ahead of time; pass the result to pick_hint() once a hint is actually given.
+
+    :param dict game_object: Object to hint about with 'name', 'dutch_name', and 'features' (color, size, shape)
+    :param int difficulty: Difficulty level (1=easy, 2=medium, 3=hard)
+    :param int round_num: Current round number (0-based)
+    :param list previous_hints: List of previous hints given (default None)
+    :return: The hint prompt (None for a fallback hint) and the candidate hints
+    :rtype: tuple
+    """
+    previous_hints = tuple(previous_hints[-PROMPT_HINT_HISTORY:]) if previous_hints else ()
+
     try:
-        hint = _generate_gpt_hint(game_object, difficulty, round_num, previous_hints)
-        return hint.strip('"\'')
+        prompt = _hint_prompt(game_object, difficulty, round_num, previous_hints)
+        return prompt, _request_hints(prompt)
     except Exception as e:
         logger.error(f"Error generating hint: {e}")
-        return _fallback_hint(difficulty, round_num, game_object)
+        return None, (_fallback_hint(difficulty, round_num, game_object),)
+
+
+def pick_hint(hint_options):
+    """
+    Choose the hint to give from the result of request_hint_options(). Repeated requests for the
+    same game state take the next variant, so only call this for a hint that is given.
+
+    :param tuple hint_options: The hint prompt and candidate hints from request_hint_options()
+    :return: Hint string
+    :rtype: str
+    """
+    prompt, hints = hint_options
+    if prompt is None:
+        return hints[0]
+    with _variants_lock:
+        served = _variants_served.pop(prompt, 0)
+        _variants_served[prompt] = served + 1
+        if len(_variants_served) > _VARIANTS_SERVED_MAX:
+            _variants_served.popitem(last=False)
+    return hints[served % len(hints)].strip('"\'')
 
 
 def _initial_hint(difficulty, game_object):
@@ -40,47 +174,72 @@ def _initial_hint(difficulty, game_object):
     :return: Initial hint string
     :rtype: str
     """
-    color = game_object.get('features', {}).get('color', 'unknown')
-    size = game_object.get('features', {}).get('size', 'unknown')
+    features = game_object.get('features') or {}
 
     if difficulty == 1:
+        color = features.get('color', 'unknown')
         return f"The object I'm thinking of is {color}."
     elif difficulty == 2:
+        size = features.get('size', 'unknown')
         return f"I spy with my little eye, something that is {size}."
     else:
         return "I spy with my little eye, something in this room."
 
 
-def _generate_gpt_hint(game_object, difficulty, round_num, previous_hints):
+def _hint_prompt(game_object, difficulty, round_num, previous_hints):
     """
-    Use the OpenAI API to generate a dynamic hint.
+    Build the hint prompt for the current game state.
 
     :param dict game_object: Object with 'name', 'dutch_name', and 'features'
     :param int difficulty: Difficulty level (1=easy, 2=medium, 3=hard)
     :param int round_num: Current round number (0-based)
-    :param list previous_hints: List of previous hints
-    :return: Generated hint string
+    :param tuple previous_hints: The most recent previous hints
+    :return: Prompt string for _request_hints
     :rtype: str
     """
     object_name = game_object.get('name', '')
     dutch_name = game_object.get('dutch_name', '')
-    features = game_object.get('features', {})
+    features = game_object.get('features') or {}
     color = features.get('color', 'unknown')
     size = features.get('size', 'unknown')
     shape = features.get('shape', 'unknown')
 
-    prompt = _build_chat_prompt(object_name, dutch_name, color, size, shape,
-                                difficulty, round_num, previous_hints)
+    return _build_chat_prompt(object_name, dutch_name, color, size, shape,
+                              difficulty, round_num, previous_hints)
+
+
+def reset_hint_variants():
+    """
+    Forget which hint variants were given, so a new game starts at the first variant of each hint.
+    """
+    with _variants_lock:
+        _variants_served.clear()
+
 
-    api_key = chat_gtp_connection()
-    client = OpenAI(api_key=api_key)
+@lru_cache(maxsize=128)
+def _request_hints(prompt):
+    """
+    Send a hint prompt to the OpenAI API and return HINT_VARIANTS alternative hints from one call.
+    Cached on the prompt text, which holds the whole game state (object, features, difficulty,
+    round and previous hints), so a repeated state reuses the earlier hints; errors are raised, not cached.
+
+    :param str prompt: Prompt built by _build_chat_prompt
+    :return: Generated hint strings
+    :rtype: tuple
+    """
+    client = _get_client()
     response = client.chat.completions.create(
         messages=[{"role": "user", "content": prompt}],
         model="gpt-4o-mini",
         max_tokens=100,
         temperature=0.7,
+        stop=["\n\n"],
+        n=HINT_VARIANTS,
     )
-    return response.choices[0].message.content.strip()
+    hints = tuple(choice.message.content.strip() for choice in response.choices if choice.message.content)
+    if not hints:
+        raise ValueError("Empty hint response")
+    return hints
 
 
 def _build_chat_prompt(obj_name, dutch_name, color, size, shape, difficulty, round_num, prev_hints):
@@ -94,60 +253,17 @@ def _build_chat_prompt(obj_name, dutch_name, color, size, shape, difficulty, rou
     :param str shape: Object shape
     :param int difficulty: Difficulty level (1=easy, 2=medium, 3=hard)
     :param int round_num: Current round number (0-based)
-    :param list prev_hints: List of previous hints
+    :param tuple prev_hints: The most recent previous hints
     :return: Detailed prompt string for the OpenAI API
     :rtype: str
     """
+    rubric = _RUBRIC.get((difficulty, min(round_num, 2))) or _RUBRIC[(3, min(round_num, 2))]
     prompt = (
         f"I'm playing an 'I Spy' game where players guess this object: '{obj_name}' (Dutch: '{dutch_name}'). "
         f"The object has these features: color: {color}, size: {size}, shape: {shape}.\n\n"
-        f"This is round {round_num + 1} of the game, difficulty level {difference} (1=easy, 3=hard).\n\n"
-        f"Previous hints given: {prev_hints}\n\n"
-        "Please generate a single hint for this round that:"
-    )
-
-    if round_num == 0:
-        prompt += (
-            "\n- Is in English only"
-            "\n- Mentions the color of the object"
-            "\n- Is clear and straightforward for all players"
-        )
-    elif round_num == 1:
-        prompt += (
-            "\n- Is in Dutch only, enclosed in <nl>...</nl> tags"
-            "\n- Mentions the shape of the object"
-            "\n- Uses simple Dutch vocabulary"
-            "\n- Avoids contextual clues (e.g., usage or location)"
-        )
-    else:
-        prompt += (
-            "\n- Is bilingual: first in Dutch (in <nl>...</nl> tags), then in English"
-            "\n- Mentions a feature like size or another attribute"
-            "\n- Avoids contextual clues in early rounds"
-            f"\n- Gets more specific as rounds progress (this is round {round_num + 1})"
-        )
-
-    if difficulty == 1:
-        prompt += (
-            "\n- Is suitable for younger players"
-            "\n- Makes the object fairly easy to guess by round 3"
-        )
-    elif difficulty == 2:
-        prompt += (
-            "\n- Is moderately challenging but fair"
-            "\n- Requires some thinking"
-        )
-    else:
-        prompt += (
-            "\n- Is challenging with indirect references"
-            "\n- Requires creative thinking"
-        )
-
-    prompt += (
-        "\n\nYour response should be just the hint itself - no explanations."
-        "\nThe hint should be ONE sentence, simple enough for a robot to speak."
-        "\nDo not reveal the object directly."
-    )
+        f"This is round {round_num + 1} of the game, difficulty level {difficulty} (1=easy, 3=hard).\n\n"
+        f"Previous hints given: {list(prev_hints)}\n\n"
+    ) + rubric.format(round=round_num + 1)
 
     logger.debug("Built prompt for hint generation: %s", prompt)
     return prompt
@@ -163,34 +279,10 @@ def _fallback_hint(difficulty, round_num, game_object):
     :return: Fallback hint string
     :rtype: str
     """
-    color = game_object.get('features', {}).get('color', 'unknown')
-    size = game_object.get('features', {}).get('size', 'unknown')
-    shape = game_object.get('features', {}).get('shape', 'unknown')
-
-    fallback_hints = {
-        1: [
-            f"It is {color} in color.",
-            f"It is {size} in size.",
-            f"It has a {shape} shape.",
-            "You might use this object every day.",
-            "Look around the room carefully."
-        ],
-        2: [
-            "This object is used for a specific purpose.",
-            "You might find this in many homes or offices.",
-            f"Think about objects that are {size}.",
-            "This object has a specific function.",
-            "It's something you might interact with regularly."
-        ],
-        3: [
-            "This object serves a purpose that helps people.",
-            "Look beyond the obvious things in the room.",
-            "Consider objects you might take for granted.",
-            "This object has been around for quite some time.",
-            "Think about what you use in your daily activities."
-        ]
-    }
-
-    difficulty_hints = fallback_hints.get(difficulty, fallback_hints[1])
+    features = game_object.get('features') or {}
+    difficulty_hints = _FALLBACK_HINTS.get(difficulty, _FALLBACK_HINTS[1])
     hint_index = min(round_num, len(difficulty_hints) - 1)
-    return difficulty_hints[hint_index]
\ No newline at end of file
+    # Only the chosen template is filled in
+    return difficulty_hints[hint_index].format(color=features.get('color', 'unknown'),
+                                               size=features.get('size', 'unknown'),
+                                               shape=features.get('shape', 'unknown'))
\ No newline at end of file
@@ -1,12 +1,19 @@
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.threads import deferToThread
 from autobahn.twisted.util import sleep
 from assignment_3.gesture_control.say_animated import say_animated
-from assignment_3.api.give_hint import give_hint
+from assignment_3.api.give_hint import pick_hint, request_hint_options
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Requests recognized in a response to a question (also "hints", "repeating", ...).
+_REQUEST_RE = re.compile(r'\b(repeat|hint)')
+
+# Splits spoken text into plain segments and Dutch <nl>...</nl> segments (kept, as a capture group).
+_NL_PATTERN = re.compile(r'(<nl>.*?</nl>)')
+
 class DialogueManager:
     def __init__(self, session, stt):
         self.session = session  # WAMP session for TTS and gestures
@@ -23,8 +30,7 @@ class DialogueManager:
             text (str): The text to speak, with Dutch words marked as <nl>word</nl>.
             gesture (str, optional): Gesture to perform while speaking the first segment.
         """
-        pattern = re.compile(r'(<nl>.*?</nl>)')
-        segments = pattern.split(text)
+        segments = _NL_PATTERN.split(text)
         first_segment = True
         for segment in segments:
             if segment.startswith('<nl>') and segment.endswith('</nl>'):
@@ -39,19 +45,36 @@ class DialogueManager:
                     yield say_animated(self.session, segment, gesture_name=None, lang="en")
                 logger.debug(f"Spoke English: '{segment}' in en")
 
+    @staticmethod
+    def _join_words(words):
+        """
+        Join the recognized sentences into one response.
+
+        :param words: Sentences from the STT, as strings or (text, confidence) tuples
+        :return: The joined response, or None if the words have an unexpected type
+        """
+        if isinstance(words[0], str):
+            return " ".join(words)
+        elif isinstance(words[0], tuple) and len(words[0]) > 0 and isinstance(words[0][0], str):
+            return " ".join([word[0] for word in words])
+        logger.warning(f"Unexpected type in words: {type(words[0])}")
+        return None
+
     @inlineCallbacks
-    def listen(self, timeout=None, silence_after_speech=2.0, poll_interval=1.0):
+    def listen(self, timeout=None, silence_after_speech=2.0, poll_interval=0.1):
         """
         Listen for a response with incremental checking, a total timeout, and silence detection.
 
         :param timeout: Maximum time to wait for a response (seconds), defaults to self.default_timeout
         :param silence_after_speech: Time to wait after detecting speech to confirm end (seconds)
-        :param poll_interval: How often to check for STT words (seconds)
+        :param poll_interval: How often to check for STT words (seconds); a check only compares the
+            number of recognized sentences, so a short interval adds little latency at little cost
         :return: The detected response or None if timeout is reached
         """
         timeout = timeout or self.default_timeout
         self.stt.words = []
         waited = 0.0
+        heard = 0  # Number of recognized sentences seen so far
         response = None
         silence_waited = 0.0
 
@@ -60,45 +83,37 @@ class DialogueManager:
         while waited < timeout:
             yield sleep(poll_interval)
             waited += poll_interval
+            # The STT appends sentences to the same list, so new speech shows up as a longer list.
             words = self.stt.give_me_words()
 
-            if words:
-                if isinstance(words[0], str):
-                    response = " ".join(words)
-                elif isinstance(words[0], tuple) and len(words[0]) > 0 and isinstance(words[0][0], str):
-                    response = " ".join([word[0] for word in words])
-                else:
-                    logger.warning(f"Unexpected type in words: {type(words[0])}")
-                    response = None
-
+            if len(words) > heard:
+                heard = len(words)
+                response = self._join_words(words)
+                silence_waited = 0.0
                 logger.debug(f"Detected speech after {waited:.1f}s: {response}")
+            elif response is not None:
+                silence_waited += poll_interval
+                if silence_waited >= silence_after_speech:
+                    logger.debug(f"Silence detected for {silence_after_speech}s, returning: {response}")
+                    return response
 
-                while silence_waited < silence_after_speech:
-                    yield sleep(poll_interval)
-                    silence_waited += poll_interval
-                    waited += poll_interval
-                    new_words = self.stt.give_me_words()
-
-                    if new_words != words:
-                        words = new_words
-                        silence_waited = 0.0
-                        if isinstance(words[0], str):
-                            response = " ".join(words)
-                        elif isinstance(words[0], tuple) and len(words[0]) > 0 and isinstance(words[0][0], str):
-                            response = " ".join([word[0] for word in words])
-                        logger.debug(f"More speech detected, updated response: {response}")
-
-                    if waited >= timeout:
-                        logger.debug(f"Timeout reached during silence wait, returning: {response}")
-                        return response
+        if response is not None:
+            logger.debug(f"Timeout reached during silence wait, returning: {response}")
+        else:
+            logger.debug(f"Timeout ({timeout}s) reached with no response.")
+        return response
 
-                logger.debug(f"Silence detected for {silence_after_speech}s, returning: {response}")
-                return response
-            else:
-                logger.debug(f"Waiting for speech... ({waited:.1f}/{timeout}s)")
+    def _request_hint(self, game_context):
+        """
+        Start generating the hint options for the current round in a thread; the hint itself is
+        only picked (pick_hint) when it is said, so a hint requested ahead of time and never used
+        does not use up a variant.
 
-        logger.debug(f"Timeout ({timeout}s) reached with no response.")
-        return None
+        :param game_context: Dict with game info (game_object, difficulty, round_num)
+        :return: Deferred firing with the hint options
+        """
+        return deferToThread(request_hint_options, game_context['game_object'], game_context['difficulty'],
+                             game_context['round_num'])
 
     @inlineCallbacks
     def ask_with_reprompt(self, prompt, gesture=None, max_attempts=3, game_context=None, timeout=None):
@@ -118,17 +133,20 @@ class DialogueManager:
             "No answer yet? Try a guess or say 'hint'!"
         ]
 
+        pending_hint = None  # Hint requested ahead of time, while the robot is still talking
         for attempt in range(max_attempts):
             current_prompt = prompt if attempt == 0 else reprompt_phrases[min(attempt - 1, len(reprompt_phrases) - 1)]
             yield self.say(current_prompt, gesture)
             response = yield self.listen(timeout=timeout)
 
             if response:
-                response_lower = response.lower()
-                if "repeat" in response_lower:
+                requests = set(_REQUEST_RE.findall(response.lower()))
+                if "repeat" in requests:
                     continue
-                elif "hint" in response_lower and game_context:
-                    hint = give_hint(game_context['game_object'], game_context['difficulty'], game_context['round_num'])
+                elif "hint" in requests and game_context:
+                    hint_options = yield (pending_hint or self._request_hint(game_context))
+                    pending_hint = None
+                    hint = pick_hint(hint_options)
                     yield self.say(hint, gesture="beat_gesture")
                     # Check understanding for Dutch hints (handled below)
                     response = yield self.listen(timeout=timeout)
@@ -136,9 +154,16 @@ class DialogueManager:
                         return response
                 else:
                     return response
+            elif attempt == 0 and game_context and max_attempts > 1:
+                # A second timeout brings a hint, so start on it during the reprompt.
+                pending_hint = self._request_hint(game_context)
             elif attempt == 1 and game_context:  # After second timeout, offer a hint
+                # The hint is requested before (or while) the robot announces it.
+                hint_deferred = pending_hint or self._request_hint(game_context)
+                pending_hint = None
                 yield self.say("Seems tricky! Here’s a hint to help.", gesture="beat_gesture")
-                hint = give_hint(game_context['game_object'], game_context['difficulty'], game_context['round_num'])
+                hint_options = yield hint_deferred
+                hint = pick_hint(hint_options)
                 yield self.say(hint, gesture="beat_gesture")
                 # Check understanding for Dutch hints (handled below)
             elif attempt == max_attempts - 1:
@@ -1,4 +1,5 @@
 import logging
+import re
 from twisted.internet.defer import inlineCallbacks
 from assignment_3.dialogue.dialogue_manager import DialogueManager
 from assignment_3.game_control.user_guesses import play_game_user_guesses
@@ -11,6 +12,22 @@ logging.basicConfig(
     datefmt='%H:%M:%S')
 logger = logging.getLogger(__name__)
 
+# Answers recognized in the player's responses, matched as whole words so that e.g. "know" is not a "no".
+_KEYWORD_RE = re.compile(r"\b(yes|no|i guess|you guess)\b")
+
+
+def _keywords(response):
+    """
+    Find the recognized answers in a response with a single scan.
+
+    :param response: The player's response, or None
+    :type response: str or None
+    :return: The answers found in the response
+    :rtype: set
+    """
+    return set(_KEYWORD_RE.findall(response.lower())) if response else set()
+
+
 @inlineCallbacks
 def play_game(session, stt, scan_mode="static"):
     """
@@ -46,7 +63,7 @@ def play_game(session, stt, scan_mode="static"):
         # Ask if the user wants to play
         yield dialogue_manager.say("Do you want to play a game, " + user_name + "? Please say Yes or No.", gesture="beat_gesture")
         response = yield dialogue_manager.listen(timeout=10)
-        if not response or "no" in response.lower():
+        if not response or "no" in _keywords(response):
             yield dialogue_manager.say("Okay, maybe next time!", gesture="shake_no")
             playing = False
             break
@@ -74,10 +91,11 @@ def play_game(session, stt, scan_mode="static"):
             gesture="beat_gesture"
         )
         choice = yield dialogue_manager.listen(timeout=10)
-        if choice and "i guess" in choice.lower():
+        choice_keywords = _keywords(choice)
+        if "i guess" in choice_keywords:
             logger.debug("User chose 'I guess' mode.")
             yield play_game_user_guesses(session, stt, dialogue_manager, difficulty=difficulty, scan_mode=scan_mode)
-        elif choice and "you guess" in choice.lower():
+        elif "you guess" in choice_keywords:
             logger.debug("User chose 'You guess' mode.")
             yield play_game_robot_guesses(session, stt, dialogue_manager, difficulty=difficulty, scan_mode=scan_mode)
         else:
@@ -87,7 +105,7 @@ def play_game(session, stt, scan_mode="static"):
         # Ask to play again
         yield dialogue_manager.say("Do you want to play again, " + user_name + "? Please say Yes or No.", gesture="beat_gesture")
         again = yield dialogue_manager.listen(timeout=10)
-        if again and "yes" in again.lower():
+        if "yes" in _keywords(again):
             playing = True
         else:
             playing = False
@@ -1,4 +1,5 @@
 import logging
+import random
 from twisted.internet.defer import inlineCallbacks
 from autobahn.twisted.util import sleep
 from assignment_3.gesture_control.scanning import run_scan
@@ -13,7 +14,6 @@ def robot_guess(detected_objects, hints):
     possible_objects = [obj for obj in detected_objects if all(hint in obj['features'] for hint in hints)]
     if not possible_objects:
         return "I can’t find any object that matches your hints."
-    import random
     guess = random.choice(possible_objects)
     return f"Is it a {guess['dutch_name']} or {guess['name']}?"
 
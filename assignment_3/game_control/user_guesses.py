@@ -1,8 +1,9 @@
 import logging
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.threads import deferToThread
 from autobahn.twisted.util import sleep
 from assignment_3.gesture_control.scanning import run_scan
-from assignment_3.api.api_handler import choose_object, start_i_spy_game, process_guess
+from assignment_3.api.api_handler import choose_object, start_i_spy_game, prefetch_hint, process_guess
 from assignment_3.gesture_control.point_to_object import point_to_object
 
 logger = logging.getLogger(__name__)
@@ -38,19 +39,25 @@ def play_game_user_guesses(session, stt, dialogue_manager, difficulty=1, scan_mo
     yield dialogue_manager.say("Let me look around for something interesting...", gesture="beat_gesture")
     scan_results, detected_objects = yield run_scan(session, mode=scan_mode)
 
-    chosen_object = choose_object(detected_objects, difficulty)
+    # The API calls run in a thread so the reactor keeps handling STT and motion meanwhile.
+    chosen_object = yield deferToThread(choose_object, detected_objects, difficulty)
     if not chosen_object:
         yield dialogue_manager.say("I couldn't find anything interesting. Sorry!", gesture="shake_no")
         return
 
-    intro, initial_hint = start_i_spy_game(chosen_object, difficulty)
+    intro, initial_hint = yield deferToThread(start_i_spy_game, chosen_object, difficulty)
     yield dialogue_manager.say(intro, gesture="beat_gesture")
     yield dialogue_manager.say(initial_hint, gesture="beat_gesture")
 
     round_num = 0
     max_rounds = 8
     previous_hints = [initial_hint]
+    hint_future = None
     while round_num < max_rounds:
+        # Generate the next hint's options while the player is thinking. They are only used if the guess
+        # is wrong; a correct guess wastes this API call, which is accepted to keep wrong guesses fast.
+        if hint_future is None:
+            hint_future = prefetch_hint(chosen_object, round_num, previous_hints)
         game_context = {
             'game_object': chosen_object,
             'difficulty': difficulty,
@@ -64,7 +71,9 @@ def play_game_user_guesses(session, stt, dialogue_manager, difficulty=1, scan_mo
             yield dialogue_manager.say("I didn’t catch that. Let’s try again!", gesture="shake_no")
             continue
 
-        response_text, is_correct = process_guess(guess, chosen_object, round_num, previous_hints)
+        response_text, is_correct = yield deferToThread(process_guess, guess, chosen_object, round_num,
+                                                        previous_hints, hint_future)
+        hint_future = None
         yield dialogue_manager.say(response_text, gesture="beat_gesture")
         if is_correct:
             yield dialogue_manager.say(f"Here it is!", gesture="beat_gesture")
@@ -1,5 +1,6 @@
 # /gesture_control/generate_frames.py
 import random
+from types import MappingProxyType
 
 # Only the head and arms, removing legs since they're not being used.
 # Format: joint_name: (min_angle, max_angle, min_time)
@@ -14,7 +15,12 @@ HW_LIMITS_HEAD_ARMS = {
     "body.arms.right.upper.pitch": (-2.59, 1.59, 1600)
 }
 
+# Neutral (all zero) pose for the joints above. Read-only; frames get their own copy
+# because perform_movement may modify the frames it is given.
+_NEUTRAL_DATA = MappingProxyType({joint: 0.0 for joint in HW_LIMITS_HEAD_ARMS})
 
+# (min_angle, max_angle) per joint, used for the random peak of a beat gesture.
+_ANGLE_LIMITS = {joint: (min_val, max_val) for joint, (min_val, max_val, _) in HW_LIMITS_HEAD_ARMS.items()}
 
 
 def _clamp(value, low, high):
@@ -29,33 +35,16 @@ def generate_beat_frames(duration=2000, scale=1.6):
     Round angles to 3 decimals so we don't produce too many decimal places.
     """
 
-    neutral_data = {
-        "body.head.yaw": 0.0,
-        "body.head.roll": 0.0,
-        "body.head.pitch": 0.0,
-        "body.arms.left.upper.pitch": 0.0,
-        "body.arms.right.upper.pitch": 0.0
-    }
-
     frame0 = {
         "time": 0,
-        "data": neutral_data.copy()
-    }
-
-
-    from_limits = {
-      "body.head.yaw": (-0.874, 0.874),
-      "body.head.roll": (-0.174, 0.174),
-      "body.head.pitch": (-0.174, 0.174),
-      "body.arms.left.upper.pitch": (-2.59, 1.59),
-      "body.arms.right.upper.pitch": (-2.59, 1.59)
+        "data": dict(_NEUTRAL_DATA)
     }
 
     half_time = duration // 2
     peak_data = {}
     amplitude_factor = 0.2  # up to ±20% of limit
 
-    for joint, (min_val, max_val) in from_limits.items():
+    for joint, (min_val, max_val) in _ANGLE_LIMITS.items():
         # e.g. amplitude is 20% of the absolute range
         range_ = (max_val - min_val) * amplitude_factor
         rand_angle = random.uniform(-range_, range_) * scale
@@ -74,7 +63,7 @@ def generate_beat_frames(duration=2000, scale=1.6):
 
     frame2 = {
         "time": duration,
-        "data": neutral_data.copy()
+        "data": dict(_NEUTRAL_DATA)
     }
 
     return [frame0, frame1, frame2]
\ No newline at end of file
@@ -4,7 +4,8 @@ import json
 import logging
 import random
 import time
-from twisted.internet.defer import inlineCallbacks
+from functools import lru_cache
+from twisted.internet.defer import Deferred, DeferredList, ensureDeferred, inlineCallbacks
 from autobahn.twisted.util import sleep
 from alpha_mini_rug import perform_movement
 
@@ -19,19 +20,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load the gesture library once.
+# The gesture library is parsed the first time a gesture is requested, not at import.
 GESTURE_FILE = os.path.join(os.path.dirname(__file__), "../gestures.json")
-try:
-    with open(GESTURE_FILE, "r") as f:
-        GESTURE_LIBRARY = json.load(f)
-    logger.debug("Loaded gesture library with keys: %s", list(GESTURE_LIBRARY.keys()))
-except Exception as e:
-    logger.error("Could not load gesture library: %s", e)
-    GESTURE_LIBRARY = {}
 
 
-@inlineCallbacks
-def loop_gesture(session, dialogue_deferred, start_time, estimated_duration):
+@lru_cache(maxsize=None)
+def _load_gesture_library():
+    """
+    Loads and parses the gesture library once.
+    """
+    try:
+        with open(GESTURE_FILE, "r") as f:
+            library = json.load(f)
+        logger.debug("Loaded gesture library with keys: %s", list(library.keys()))
+        return library
+    except Exception as e:
+        logger.error("Could not load gesture library: %s", e)
+        return {}
+
+
+@lru_cache(maxsize=None)
+def get_gesture_keyframes(gesture_name):
+    """
+    Returns the keyframes of a library gesture as a tuple (memoized per gesture),
+    or None if the gesture is not in the library.
+    """
+    gesture = _load_gesture_library().get(gesture_name)
+    if gesture is None:
+        return None
+    return tuple(gesture.get("keyframes", []))
+
+
+def _signal_when_done(deferred):
+    """
+    Returns a Deferred that fires (with None) once `deferred` has fired, leaving its result untouched.
+    """
+    done = Deferred()
+
+    def _fire(result):
+        done.callback(None)
+        return result
+
+    deferred.addBoth(_fire)
+    return done
+
+
+async def loop_gesture(session, dialogue_deferred, start_time, estimated_duration):
     """
     Repeatedly perform the given (beat) gesture, optionally with noise, until
     (1) the TTS is finished, or
@@ -42,6 +76,7 @@ def loop_gesture(session, dialogue_deferred, start_time, estimated_duration):
     movement_duration = 1.0  # 2 seconds
 
 
+    dialogue_done = _signal_when_done(dialogue_deferred)
     while not dialogue_deferred.called:
         # 1) Generate on-the-fly
         # logger.debug("Generating beat gesture frames (2s).")
@@ -67,8 +102,8 @@ def loop_gesture(session, dialogue_deferred, start_time, estimated_duration):
         # Perform movement in async mode
         perform_movement(session, frames, mode="linear", sync=False, force=True)
 
-        # Wait for it to finish
-        yield sleep(movement_duration)
+        # Wait for it to finish, or stop as soon as the dialogue is done.
+        await DeferredList([sleep(movement_duration), dialogue_done], fireOnOneCallback=True)
 
     logger.debug("Exiting gesture loop after %d iterations.", iteration)
 
@@ -90,7 +125,7 @@ def say_animated(session, text, gesture_name=None, lang=None):
     """
     Animated speech:
     - If gesture_name == "beat_gesture", generate frames, smooth them, then loop.
-    - If gesture_name is in GESTURE_LIBRARY, run it once, with smoothing if desired.
+    - If gesture_name is in the gesture library, run it once, with smoothing if desired.
     - Else skip gestures.
 
     We estimate TTS duration by 0.4s/word and stop the loop if that time is exceeded
@@ -112,18 +147,20 @@ def say_animated(session, text, gesture_name=None, lang=None):
         dialogue_deferred = session.call("rie.dialogue.say", text=text)
 
     # Estimate TTS duration
-    word_count = len(text.split())
+    # Count the spaces instead of splitting, so no list of words is built just to be counted.
+    stripped = text.strip()
+    word_count = stripped.count(" ") + 1 if stripped else 0
     estimated_duration = word_count * 0.4
     logger.debug("Estimated speech duration: %.2f seconds", estimated_duration)
 
     # Decide gesture approach
     if gesture_name == "beat_gesture":
         # Loop until TTS is done or estimate is exceeded
-        yield loop_gesture(session, dialogue_deferred, start_time, estimated_duration)
+        yield ensureDeferred(loop_gesture(session, dialogue_deferred, start_time, estimated_duration))
 
-    elif gesture_name in GESTURE_LIBRARY:
+    elif gesture_name and get_gesture_keyframes(gesture_name) is not None:
         # 1) Load from library
-        frames = GESTURE_LIBRARY[gesture_name].get("keyframes", [])
+        frames = list(get_gesture_keyframes(gesture_name))
         if not frames:
             logger.warning("Gesture '%s' found in library but has no keyframes!", gesture_name)
         else:
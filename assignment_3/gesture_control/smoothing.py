@@ -1,5 +1,5 @@
 # /gesture_control/smoothing.py
-import random
+import numpy as np
 
 """
 Smoothing functionality is currently disabled due to microstops observed in the robot's motion.
@@ -11,11 +11,44 @@ def ease_in_out(t):
     """
     Ease-in-out interpolation function producing an S-curve.
 
-    :param float t: Interpolation parameter between 0 and 1
-    :return: Smoothed interpolation value
-    :rtype: float
+    :param t: Interpolation parameter between 0 and 1 (a float or a NumPy array, evaluated elementwise)
+    :type t: float or numpy.ndarray
+    :return: Smoothed interpolation value, 3t^2 - 2t^3 in Horner form
+    :rtype: float or numpy.ndarray
     """
-    return 3 * (t ** 2) - 2 * (t ** 3)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def _interpolate_segment(start_frame, end_frame, steps):
+    """
+    Computes the intermediate frames between two keyframes in one NumPy pass (ease-in-out timing,
+    linear joint interpolation and a small random perturbation per joint).
+
+    :param dict start_frame: Keyframe the segment starts at
+    :param dict end_frame: Keyframe the segment ends at; joints missing here keep their start value
+    :param int steps: Number of sub-segments (steps - 1 frames are returned)
+    :return: Intermediate frames with times and angles rounded to 3 decimal places
+    :rtype: list
+    """
+    if steps < 2:
+        return []
+    start_data = start_frame["data"]
+    joints = list(start_data)
+    start_vals = np.array([start_data[j] for j in joints], dtype=float)
+    end_vals = np.array([end_frame["data"].get(j, start_data[j]) for j in joints], dtype=float)
+    start_time = float(start_frame["time"])
+    delta_time = float(end_frame["time"]) - start_time
+
+    t_smooth = ease_in_out(np.arange(1, steps) / float(steps))
+    times = np.round(start_time + delta_time * t_smooth, 3)
+    values = start_vals + (end_vals - start_vals) * t_smooth[:, None]
+    values += np.random.uniform(-0.005, 0.005, size=values.shape)
+    values = np.round(values, 3)
+
+    return [
+        {"time": new_time, "data": dict(zip(joints, row))}
+        for new_time, row in zip(times.tolist(), values.tolist())
+    ]
 
 
 def smooth_predefined_frames(keyframes, steps=2):
@@ -34,7 +67,6 @@ def smooth_predefined_frames(keyframes, steps=2):
         end_frame = keyframes[i + 1]
         start_time = float(start_frame["time"])
         end_time = float(end_frame["time"])
-        delta_time = end_time - start_time
 
         if i == 0:
             smoothed_frames.append({
@@ -42,24 +74,7 @@ def smooth_predefined_frames(keyframes, steps=2):
                 "data": {j: round(a, 3) for j, a in start_frame["data"].items()}
             })
 
-        for step_i in range(1, steps):
-            t = step_i / float(steps)
-            t_smooth = ease_in_out(t)
-            new_time = start_time + delta_time * t_smooth
-            new_time = round(new_time, 3)
-
-            new_data = {}
-            for joint, start_val in start_frame["data"].items():
-                end_val = end_frame["data"].get(joint, start_val)
-                val = start_val + (end_val - start_val) * t_smooth
-                val += random.uniform(-0.005, 0.005)
-                val = round(val, 3)
-                new_data[joint] = val
-
-            smoothed_frames.append({
-                "time": new_time,
-                "data": new_data
-            })
+        smoothed_frames.extend(_interpolate_segment(start_frame, end_frame, steps))
 
         smoothed_frames.append({
             "time": round(end_time, 3),
@@ -85,7 +100,6 @@ def smooth_keyframes(keyframes, steps=1):
         end_frame = keyframes[i + 1]
         start_time = float(start_frame["time"])
         end_time = float(end_frame["time"])
-        delta_time = end_time - start_time
 
         if i == 0:
             smoothed_frames.append({
@@ -93,24 +107,7 @@ def smooth_keyframes(keyframes, steps=1):
                 "data": {j: round(a, 3) for j, a in start_frame["data"].items()}
             })
 
-        for step_i in range(1, steps):
-            t = step_i / float(steps)
-            t_smooth = ease_in_out(t)
-            new_time = start_time + delta_time * t_smooth
-            new_time = round(new_time, 3)
-
-            new_data = {}
-            for joint, start_val in start_frame["data"].items():
-                end_val = end_frame["data"].get(joint, start_val)
-                val = start_val + (end_val - start_val) * t_smooth
-                val += random.uniform(-0.005, 0.005)
-                val = round(val, 3)
-                new_data[joint] = val
-
-            smoothed_frames.append({
-                "time": new_time,
-                "data": new_data
-            })
+        smoothed_frames.extend(_interpolate_segment(start_frame, end_frame, steps))
 
         smoothed_frames.append({
             "time": round(end_time, 3),
@@ -5,7 +5,7 @@ import os
 from alpha_mini_rug.speech_to_text import SpeechToText
 from autobahn.twisted.component import Component, run
 from autobahn.twisted.util import sleep
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import Deferred, inlineCallbacks
 from twisted.internet.task import LoopingCall
 
 from assignment_3.game_control.play_game import play_game
@@ -74,8 +74,8 @@ def main(session, details):
     # Start the game with the STT instance and scan mode
     yield play_game(session, stt, scan_mode=args.scan_mode)
 
-    while True:
-        yield sleep(1)
+    # Keep the session alive without waking the reactor: this Deferred never fires.
+    yield Deferred()
 
 wamp = Component(
     transports=[{
@@ -10,6 +10,7 @@ import logging
 import json
 import sys
 import time
+import threading
 from PIL import Image
 import io
 from ..api.conn import chat_gtp_connection
@@ -17,6 +18,29 @@ from ..api.conn import chat_gtp_connection
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared OpenAI client, created on first use so repeated analyses reuse its connection pool.
+# Scans can run concurrently, so creating it is locked.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """
+    Return the shared OpenAI client, creating it the first time it is needed.
+
+    :return: The shared client
+    :rtype: openai.OpenAI
+    :raises ImportError: If the OpenAI Python client is not installed
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI()
+    return _client
+
+
 def encode_image_to_base64(image):
     """
     Encode a PIL Image to base64 string.
@@ -43,8 +67,7 @@ def analyze_image_with_chatgpt_vision(image, prompt=None):
     """
     try:
         # Try to import OpenAI client
-        from openai import OpenAI
-        client = OpenAI()
+        client = _get_client()
     except ImportError:
         logger.error("OpenAI Python client not installed. Please install it with: pip install openai")
         return {"error": "OpenAI client not installed"}